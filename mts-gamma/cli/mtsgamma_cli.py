@@ -3,20 +3,36 @@ from __future__ import annotations
 
 import argparse
 import sys
+import time
 
 import numpy as np
 
 from mtsgamma import (
     SolverParams,
     christofides_route,
+    gap_pct,
+    held_karp_bound,
     load_embedded,
     load_tsplib_file,
     mts_gamma_C4,
     parameter_sweep,
+    resume_c4,
     run_stability_tests,
+    serve,
     tour_length,
 )
+from mtsgamma.backends import available_backends, default_backend_name, get_backend, registered_backends
+from mtsgamma.checkpoint import DEFAULT_CHECKPOINT_INTERVAL
 from mtsgamma.field import DEFAULT_GRID
+from mtsgamma.refine import check_dp_window
+from mtsgamma.service import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_QUEUE_SIZE, DEFAULT_TIME_LIMIT, DEFAULT_WORKERS
+
+
+def _dp_window(value: str) -> int:
+    try:
+        return check_dp_window(int(value))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
 
 
 def _load_coords(args: argparse.Namespace) -> np.ndarray:
@@ -24,18 +40,84 @@ def _load_coords(args: argparse.Namespace) -> np.ndarray:
         return load_tsplib_file(args.file, grid=DEFAULT_GRID)
     if args.dataset:
         return load_embedded(args.dataset, grid=DEFAULT_GRID)
+    if getattr(args, "seed", None) is not None:
+        np.random.seed(args.seed)
     return np.random.rand(args.n, 2) * (DEFAULT_GRID - 4)
 
 
 def cmd_solve(args: argparse.Namespace) -> None:
     coords = _load_coords(args)
-    params = SolverParams()
+    params = SolverParams(
+        dp_window=args.dp_window,
+        target_gap_pct=args.target_gap,
+        compact=args.compact,
+        backend=args.backend,
+    )
     route = christofides_route(coords)
     c_len = tour_length(route, coords)
-    mts_route, mts_len = mts_gamma_C4(coords, params=params)
+    # The bound ends with a dense O(N^2) pass; only pay for it when asked.
+    bound = None
+    if args.bound or args.target_gap is not None:
+        bound = held_karp_bound(coords, upper_bound=c_len)
+    mts_route, mts_len = mts_gamma_C4(
+        coords,
+        params=params,
+        checkpoint_path=args.checkpoint,
+        checkpoint_interval=args.checkpoint_interval,
+        lower_bound=bound,
+    )
     print("Christofides length:", c_len)
     print("MTS–Gamma C4 length:", mts_len)
     print("Improvement %:", (c_len - mts_len) / c_len * 100)
+    if bound is not None:
+        print("Held–Karp lower bound:", bound)
+        print("MTS–Gamma gap to bound %:", gap_pct(mts_len, bound))
+
+
+def cmd_resume(args: argparse.Namespace) -> None:
+    coords = _load_coords(args)
+    _, length = resume_c4(
+        coords,
+        args.checkpoint,
+        dp_window=args.dp_window,
+        checkpoint_interval=args.checkpoint_interval,
+        backend=args.backend,
+    )
+    print("MTS–Gamma C4 length:", length)
+
+
+def _time_stages(backend, coords: np.ndarray, grid: int) -> list[float]:
+    times = []
+    start = time.perf_counter()
+    field = backend.build_field(coords, grid=grid)
+    times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    route = backend.gradient_flow(field, coords, grid=grid).astype(np.int32)
+    times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    backend.two_point_five_opt_sweep(route, coords)
+    times.append(time.perf_counter() - start)
+    return times
+
+
+def cmd_backends(args: argparse.Namespace) -> None:
+    default = default_backend_name()
+    for name, backend in registered_backends().items():
+        status = "available" if backend.is_available() else "unavailable"
+        marker = " (default)" if name == default else ""
+        print(f"{name:<16} {status:<12} {backend.description}{marker}")
+    if not args.bench:
+        return
+
+    rng = np.random.default_rng(0)
+    warm = rng.random((32, 2)) * 60
+    coords = rng.random((args.bench, 2)) * (args.grid - 4)
+    print(f"\nN={args.bench} grid={args.grid}: field, flow, one 2.5-opt sweep (seconds)")
+    for name in available_backends():
+        backend = get_backend(name)
+        _time_stages(backend, warm, 64)  # compile
+        t_field, t_flow, t_sweep = _time_stages(backend, coords, args.grid)
+        print(f"{name:<16} {t_field:8.3f} {t_flow:8.3f} {t_sweep:8.3f}")
 
 
 def cmd_sweep(args: argparse.Namespace) -> None:
@@ -49,10 +131,21 @@ def cmd_sweep(args: argparse.Namespace) -> None:
 
 
 def cmd_stability(args: argparse.Namespace) -> None:
-    run_stability_tests(seeds=args.seeds, csv_path=args.output)
+    run_stability_tests(seeds=args.seeds, csv_path=args.output, bound=args.bound)
     print("Saved stability results to", args.output)
 
 
+def cmd_serve(args: argparse.Namespace) -> None:
+    serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        default_time_limit=args.time_limit,
+        backend=args.backend,
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="mtsgamma")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -61,8 +154,42 @@ def build_parser() -> argparse.ArgumentParser:
     p_solve.add_argument("--n", type=int, default=500, help="Number of random cities")
     p_solve.add_argument("--file", type=str, help="TSPLIB .tsp file")
     p_solve.add_argument("--dataset", type=str, help="Embedded dataset name")
+    p_solve.add_argument("--seed", type=int, help="Seed for random cities")
+    p_solve.add_argument("--checkpoint", type=str, help="Write refinement checkpoints to this file")
+    p_solve.add_argument("--checkpoint-interval", dest="checkpoint_interval", type=float,
+                         default=DEFAULT_CHECKPOINT_INTERVAL, help="Seconds between checkpoints")
+    p_solve.add_argument("--dp-window", dest="dp_window", type=_dp_window, default=0,
+                         help="Window size for the Held–Karp polishing phase (0 disables)")
+    p_solve.add_argument("--target-gap", dest="target_gap", type=float,
+                         help="Stop refining once within this %% of the lower bound")
+    p_solve.add_argument("--bound", action="store_true",
+                         help="Report the Held–Karp lower bound and gap (implied by --target-gap)")
+    p_solve.add_argument("--compact", action="store_true",
+                         help="float32 field and coordinates to reduce memory")
+    p_solve.add_argument("--backend", choices=available_backends(),
+                         help="Compute backend (default: see 'mtsgamma backends')")
     p_solve.set_defaults(func=cmd_solve)
 
+    p_resume = sub.add_parser("resume", help="Continue a checkpointed refinement")
+    p_resume.add_argument("--checkpoint", type=str, required=True)
+    p_resume.add_argument("--n", type=int, default=500, help="Number of random cities")
+    p_resume.add_argument("--file", type=str, help="TSPLIB .tsp file")
+    p_resume.add_argument("--dataset", type=str, help="Embedded dataset name")
+    p_resume.add_argument("--seed", type=int, help="Seed for random cities")
+    p_resume.add_argument("--checkpoint-interval", dest="checkpoint_interval", type=float,
+                          default=DEFAULT_CHECKPOINT_INTERVAL, help="Seconds between checkpoints")
+    p_resume.add_argument("--dp-window", dest="dp_window", type=_dp_window,
+                          help="Window size for the Held–Karp polishing phase (default: from the checkpoint)")
+    p_resume.add_argument("--backend", choices=available_backends(),
+                          help="Compute backend (default: see 'mtsgamma backends')")
+    p_resume.set_defaults(func=cmd_resume)
+
+    p_backends = sub.add_parser("backends", help="List compute backends")
+    p_backends.add_argument("--bench", type=int, default=0, metavar="N",
+                            help="Also time each available backend on N random cities")
+    p_backends.add_argument("--grid", type=int, default=DEFAULT_GRID)
+    p_backends.set_defaults(func=cmd_backends)
+
     p_sweep = sub.add_parser("sweep", help="Parameter sweep")
     p_sweep.add_argument("--gamma", default="0.12,0.16,0.18")
     p_sweep.add_argument("--smooth", default="1.2,1.6,2.0")
@@ -75,8 +202,21 @@ def build_parser() -> argparse.ArgumentParser:
     p_stab = sub.add_parser("stability", help="Multi-seed stability testing")
     p_stab.add_argument("--seeds", type=int, default=20)
     p_stab.add_argument("--output", default="mts_gamma_stability.csv")
+    p_stab.add_argument("--no-bound", dest="bound", action="store_false",
+                        help="Skip the Held–Karp bound and gap columns")
     p_stab.set_defaults(func=cmd_stability)
 
+    p_serve = sub.add_parser("serve", help="Long-running solve service with warm workers")
+    p_serve.add_argument("--host", default=DEFAULT_HOST)
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    p_serve.add_argument("--queue-size", dest="queue_size", type=int, default=DEFAULT_QUEUE_SIZE)
+    p_serve.add_argument("--time-limit", dest="time_limit", type=float, default=DEFAULT_TIME_LIMIT,
+                         help="Default per-request time limit in seconds")
+    p_serve.add_argument("--backend", choices=available_backends(),
+                         help="Worker compute backend (default: numba, single-threaded)")
+    p_serve.set_defaults(func=cmd_serve)
+
     return parser
 
 
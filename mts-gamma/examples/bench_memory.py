@@ -0,0 +1,84 @@
+"""Peak memory of the pipeline in float64 and compact (float32) mode.
+
+Each mode runs in a fresh subprocess. Kernels are compiled on a small
+instance first, then the stages of ``mts_gamma_C4`` run on N cities with
+the given grid. Two numbers are reported for that run:
+
+* ``tracemalloc`` peak: the largest total size of live Python/NumPy
+  allocations;
+* peak RSS growth: ``ru_maxrss`` at the end minus the resident size
+  before the run.
+
+A full k-opt refinement is impractical at N=100k. Refinement is therefore
+represented by one Held–Karp window sweep over the same in-place route
+buffer the k-opt phases use, so peak memory is the same. ``--flow-steps``
+can be lowered for the same reason.
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from mtsgamma import build_field, gradient_flow
+from mtsgamma.refine import window_dp_sweep
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def _pipeline(coords: np.ndarray, grid: int, flow_steps: int, dtype) -> None:
+    work = np.ascontiguousarray(coords, dtype=dtype)
+    field = build_field(work, grid=grid, dtype=dtype)
+    order = gradient_flow(field, work, flow_steps=flow_steps, grid=grid)
+    del field
+    route = order.astype(np.int32)
+    del order
+    window_dp_sweep(route, work, 10)
+
+
+def _run(args: argparse.Namespace) -> None:
+    dtype = np.float32 if args.mode == "compact" else np.float64
+    warm = np.random.default_rng(0).random((64, 2)) * 60
+    _pipeline(warm, 64, 2, dtype)
+
+    coords = np.random.default_rng(1).random((args.n, 2)) * (args.grid - 4)
+
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    _pipeline(coords, args.grid, args.flow_steps, dtype)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{args.mode:>8}: tracemalloc peak {peak / 2**20:8.1f} MiB  "
+        f"peak RSS growth {max_rss - rss_before:8.1f} MiB  ({elapsed:.1f}s)",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--grid", type=int, default=2048)
+    parser.add_argument("--flow-steps", dest="flow_steps", type=int, default=450)
+    parser.add_argument("--mode", choices=["float64", "compact"], help="Run a single mode in this process")
+    args = parser.parse_args()
+
+    if args.mode:
+        _run(args)
+    else:
+        print(f"N={args.n} grid={args.grid} flow_steps={args.flow_steps}")
+        for mode in ("float64", "compact"):
+            subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--n", str(args.n), "--grid", str(args.grid),
+                 "--flow-steps", str(args.flow_steps)],
+                check=True,
+            )
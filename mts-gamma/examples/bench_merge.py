@@ -0,0 +1,74 @@
+"""Quality per extra second: partition crossover vs. more refinement.
+
+For each N, candidate tours are built from different ``gamma`` values
+(flow ordering, 2.5-opt, then the Held–Karp window polish). Starting from
+the best of the first K candidates, the script compares three ways of
+spending more time:
+
+* merging all K candidates with ``merge_tours``;
+* polishing the best candidate further (window DP with w=12);
+* building one more candidate and keeping the best of K + 1.
+
+Each line reports the length reduction relative to the best candidate and
+the reduction per second of extra compute.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from mtsgamma import build_field, gradient_flow, tour_length
+from mtsgamma.field import DEFAULT_GRID
+from mtsgamma.merge import merge_tours
+from mtsgamma.refine import two_point_five_opt_sweep, window_dp_opt
+
+
+def _candidate(coords: np.ndarray, gamma: float, sweeps: int) -> np.ndarray:
+    route = gradient_flow(build_field(coords, gamma=gamma), coords).astype(np.int32)
+    done = 0
+    while (sweeps <= 0 or done < sweeps) and two_point_five_opt_sweep(route, coords):
+        done += 1
+    return window_dp_opt(route, coords, 10)
+
+
+def _report(label: str, best: float, length: float, seconds: float) -> None:
+    gain = (best - length) / best * 100.0
+    rate = gain / seconds if seconds > 0 else float("inf")
+    print(f"  {label:<20} {seconds:8.3f}s  gain {gain:6.3f}%  ({rate:8.4f} %/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,2000,5000,10000")
+    parser.add_argument("--gammas", default="0.12,0.14,0.16,0.18,0.20")
+    parser.add_argument("--sweeps", type=int, default=0, help="2.5-opt sweeps per candidate (0: to convergence)")
+    args = parser.parse_args()
+
+    warm = np.random.default_rng(0).random((40, 2)) * 100
+    _candidate(warm, 0.16, 1)
+    window_dp_opt(np.arange(40, dtype=np.int32), warm, 12)
+
+    gammas = [float(x) for x in args.gammas.split(",")]
+    for n in (int(x) for x in args.sizes.split(",")):
+        coords = np.random.default_rng(n).random((n, 2)) * (DEFAULT_GRID - 4)
+        tours = []
+        start = time.perf_counter()
+        for gamma in gammas[:-1]:
+            tours.append(_candidate(coords, gamma, args.sweeps))
+        per_candidate = (time.perf_counter() - start) / len(tours)
+        lengths = [tour_length(t, coords) for t in tours]
+        best = min(lengths)
+        print(f"N={n}: {len(tours)} candidates ({per_candidate:.2f}s each), best {best:.1f}, worst {max(lengths):.1f}")
+
+        start = time.perf_counter()
+        _, merged = merge_tours(tours, coords)
+        _report("merge_tours", best, merged, time.perf_counter() - start)
+
+        route = tours[int(np.argmin(lengths))].copy()
+        start = time.perf_counter()
+        window_dp_opt(route, coords, 12)
+        _report("polish best (w=12)", best, tour_length(route, coords), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        extra = _candidate(coords, gammas[-1], args.sweeps)
+        _report("one more candidate", best, min(best, tour_length(extra, coords)), time.perf_counter() - start)
@@ -0,0 +1,43 @@
+"""Timing of the Held–Karp window polish for several window sizes.
+
+For each N the gradient-flow ordering is first tightened with 2.5-opt
+sweeps (capped by ``--presweeps`` so N=10k stays tractable), then
+``window_dp_opt`` is run to convergence for each window size.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from mtsgamma import build_field, gradient_flow, tour_length
+from mtsgamma.field import DEFAULT_GRID
+from mtsgamma.refine import two_point_five_opt_sweep, window_dp_opt, window_dp_sweep
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000")
+    parser.add_argument("--windows", default="8,10,12")
+    parser.add_argument("--presweeps", type=int, default=3)
+    args = parser.parse_args()
+
+    # Compile the kernels once so timings exclude JIT.
+    warm = np.random.default_rng(0).random((40, 2)) * 100
+    for w in (int(x) for x in args.windows.split(",")):
+        window_dp_sweep(np.arange(40, dtype=np.int32), warm, w)
+    two_point_five_opt_sweep(np.arange(40, dtype=np.int32), warm)
+
+    for n in (int(x) for x in args.sizes.split(",")):
+        coords = np.random.default_rng(n).random((n, 2)) * (DEFAULT_GRID - 4)
+        order = gradient_flow(build_field(coords), coords).astype(np.int32)
+        for _ in range(args.presweeps):
+            if not two_point_five_opt_sweep(order, coords):
+                break
+        base = tour_length(order, coords)
+        print(f"N={n}: start length {base:.1f}")
+        for w in (int(x) for x in args.windows.split(",")):
+            route = order.copy()
+            start = time.perf_counter()
+            window_dp_opt(route, coords, w)
+            elapsed = time.perf_counter() - start
+            gain = (base - tour_length(route, coords)) / base * 100.0
+            print(f"  w={w:2d}: {elapsed:7.3f}s  gain {gain:5.2f}%")
@@ -0,0 +1,54 @@
+"""Load generator for ``mtsgamma serve``.
+
+Start the service first (``python -m cli.mtsgamma_cli serve --workers 4``),
+then run this script to fire concurrent solve requests and report latency
+percentiles and throughput.
+"""
+import argparse
+import concurrent.futures
+import json
+import time
+import urllib.request
+
+import numpy as np
+
+from mtsgamma.field import DEFAULT_GRID
+
+
+def _post(url: str, payload: dict) -> tuple[float, str]:
+    data = json.dumps(payload).encode()
+    start = time.perf_counter()
+    req = urllib.request.Request(url + "/solve", data=data, method="POST")
+    with urllib.request.urlopen(req) as resp:
+        status = json.loads(resp.read())["status"]
+    return time.perf_counter() - start, status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--n", type=int, default=200, help="Cities per request")
+    parser.add_argument("--time-limit", dest="time_limit", type=float, default=60.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    payloads = [
+        {"coords": (rng.random((args.n, 2)) * (DEFAULT_GRID - 4)).tolist(), "time_limit": args.time_limit}
+        for _ in range(args.requests)
+    ]
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda p: _post(args.url, p), payloads))
+    wall = time.perf_counter() - start
+
+    lat = np.array([t for t, status in results if status == "ok"])
+    failed = sum(1 for _, status in results if status != "ok")
+    print(f"requests: {len(results)}  ok: {lat.size}  not ok: {failed}")
+    if lat.size:
+        print(f"latency p50: {np.percentile(lat, 50):.3f}s  p99: {np.percentile(lat, 99):.3f}s")
+    print(f"throughput: {lat.size / wall:.2f} solves/s over {wall:.1f}s")
+    with urllib.request.urlopen(args.url + "/metrics") as resp:
+        print("server metrics:", json.loads(resp.read()))
@@ -1,24 +1,39 @@
 """MTS–Gamma TSP solver package."""
 from .field import build_field
 from .flow import gradient_flow
-from .refine import refine_c4, tour_length
+from .refine import refine_c4, resume_c4, tour_length
+from .backends import Backend, available_backends, get_backend, register_backend
 from .solver import mts_gamma_C4, run_test, SolverParams
 from .christofides import christofides_route
+from .bound import held_karp_bound, gap_pct
+from .merge import merge_tours, partition_crossover
 from .tsplib import load_tsplib_file, load_embedded
 from .sweep import parameter_sweep
 from .stability import run_stability_tests
+from .service import SolveService, serve
 
 __all__ = [
     "build_field",
     "gradient_flow",
     "refine_c4",
+    "resume_c4",
     "tour_length",
+    "Backend",
+    "available_backends",
+    "get_backend",
+    "register_backend",
     "mts_gamma_C4",
     "run_test",
     "SolverParams",
     "christofides_route",
+    "held_karp_bound",
+    "gap_pct",
+    "merge_tours",
+    "partition_crossover",
     "load_tsplib_file",
     "load_embedded",
     "parameter_sweep",
     "run_stability_tests",
+    "SolveService",
+    "serve",
 ]
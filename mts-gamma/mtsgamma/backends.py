@@ -0,0 +1,345 @@
+"""Compute backends for the MTS–Gamma pipeline.
+
+A backend supplies the three compute-heavy stages: curvature field
+construction, gradient-flow advection and the C4 refinement sweeps. The
+solver only talks to the ``Backend`` interface, so new targets plug in by
+subclassing it and calling ``register_backend``.
+
+Built-in backends:
+
+* ``numpy`` – the NumPy / pure-Python reference implementation;
+* ``numba`` – single-threaded Numba kernels;
+* ``numba-parallel`` – Numba kernels that spread field diffusion, flow
+  advection and Held–Karp windows over all cores. The 2.5-opt and 3-opt
+  sweeps apply improving moves in sequence and stay single-threaded;
+* ``cuda`` – placeholder registered by ``mtsgamma.gpu``, never available.
+
+This module is the only place Numba is imported: the ``numba`` backends
+compile the kernel sources kept next to the reference code in
+``mtsgamma.field``, ``mtsgamma.flow`` and ``mtsgamma.refine``, and the
+public helpers there delegate to ``get_backend``.
+
+``get_backend(None)`` returns the backend named by the ``MTSGAMMA_BACKEND``
+environment variable, else ``numba-parallel`` when Numba is installed and
+``numpy`` otherwise.
+"""
+from __future__ import annotations
+
+import abc
+import math
+import os
+import time
+
+import numpy as np
+
+from . import field as _field
+from . import flow as _flow
+from . import refine as _refine
+from .field import (
+    DEFAULT_FINAL_SMOOTH,
+    DEFAULT_GAMMA,
+    DEFAULT_GRID,
+    DEFAULT_ITER_GAMMA,
+    DEFAULT_SMOOTH,
+)
+from .flow import DEFAULT_FLOW_STEPS, DEFAULT_STEP_SIZE
+from .refine import C4_PHASES, DEFAULT_DP_WINDOW
+
+try:  # pragma: no cover - optional dependency
+    import numba as nb
+except Exception:  # pragma: no cover
+    nb = None
+
+BACKEND_ENV_VAR = "MTSGAMMA_BACKEND"
+
+
+class Backend(abc.ABC):
+    """Kernels for one compute target.
+
+    Subclasses set ``name`` and implement the abstract kernel methods; the
+    refinement methods work in place on an ``int32`` route and return
+    whether they improved it. The ``*_until`` sweeps can stop part-way
+    at a deadline, which lets checkpoints land inside long sweeps.
+    """
+
+    name = ""
+    description = ""
+
+    def is_available(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def build_field(
+        self,
+        coords: np.ndarray,
+        grid: int = DEFAULT_GRID,
+        gamma: float = DEFAULT_GAMMA,
+        iter_gamma: int = DEFAULT_ITER_GAMMA,
+        smooth: float = DEFAULT_SMOOTH,
+        final_smooth: float = DEFAULT_FINAL_SMOOTH,
+        dtype: np.dtype = np.float64,
+    ) -> np.ndarray:
+        """Curvature field of ``coords``; see ``mtsgamma.field.build_field``."""
+
+    @abc.abstractmethod
+    def flow_values(
+        self,
+        field: np.ndarray,
+        coords: np.ndarray,
+        flow_steps: int = DEFAULT_FLOW_STEPS,
+        step_size: float = DEFAULT_STEP_SIZE,
+        grid: int = DEFAULT_GRID,
+    ) -> np.ndarray:
+        """Field value reached by each city after ``flow_steps`` ascent steps."""
+
+    def gradient_flow(
+        self,
+        field: np.ndarray,
+        coords: np.ndarray,
+        flow_steps: int = DEFAULT_FLOW_STEPS,
+        step_size: float = DEFAULT_STEP_SIZE,
+        grid: int = DEFAULT_GRID,
+    ) -> np.ndarray:
+        """Cities ranked by descending ``flow_values``."""
+
+        return np.argsort(-self.flow_values(field, coords, flow_steps, step_size, grid))
+
+    @abc.abstractmethod
+    def tour_length(self, route: np.ndarray, coords: np.ndarray) -> float:
+        """Length of the open path visiting ``coords`` in ``route`` order."""
+
+    @abc.abstractmethod
+    def two_point_five_opt_sweep_until(
+        self, route: np.ndarray, coords: np.ndarray, start: int, deadline: float
+    ) -> tuple[bool, int]:
+        """2.5-opt sweep from outer index ``start``, stopping after the
+        first outer step that ends past ``deadline`` (``time.perf_counter``).
+
+        Returns ``(improved, next)`` where ``next`` is the index to resume
+        from, or -1 if the sweep finished.
+        """
+
+    @abc.abstractmethod
+    def three_opt_sweep_until(
+        self, route: np.ndarray, coords: np.ndarray, start: int, deadline: float
+    ) -> tuple[bool, int]:
+        """3-opt counterpart of ``two_point_five_opt_sweep_until``."""
+
+    def two_point_five_opt_sweep(self, route: np.ndarray, coords: np.ndarray) -> bool:
+        return self.two_point_five_opt_sweep_until(route, coords, 0, math.inf)[0]
+
+    def three_opt_sweep(self, route: np.ndarray, coords: np.ndarray) -> bool:
+        return self.three_opt_sweep_until(route, coords, 0, math.inf)[0]
+
+    @abc.abstractmethod
+    def window_dp_sweep(self, route: np.ndarray, coords: np.ndarray, w: int = DEFAULT_DP_WINDOW) -> bool:
+        """One pass of Held–Karp windows; see ``mtsgamma.refine.window_dp_sweep``."""
+
+    def c4_phases(self, dp_window: int = 0) -> tuple:
+        """``refine.C4_PHASES`` as sweeps, plus a window-DP phase if ``dp_window``.
+
+        Each phase has the ``two_point_five_opt_sweep_until`` signature;
+        the window-DP phase always runs whole sweeps.
+        """
+
+        phases = tuple(getattr(self, f"{move}_sweep_until") for move in C4_PHASES)
+        if dp_window:
+            phases += (lambda route, coords, start, deadline: (self.window_dp_sweep(route, coords, dp_window), -1),)
+        return phases
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class NumPyBackend(Backend):
+    name = "numpy"
+    description = "NumPy / pure-Python reference kernels"
+
+    def build_field(self, coords, grid=DEFAULT_GRID, gamma=DEFAULT_GAMMA, iter_gamma=DEFAULT_ITER_GAMMA,
+                    smooth=DEFAULT_SMOOTH, final_smooth=DEFAULT_FINAL_SMOOTH, dtype=np.float64):
+        return _field._build_field(coords, grid, gamma, iter_gamma, smooth, final_smooth, dtype, _field._diffuse)
+
+    def flow_values(self, field, coords, flow_steps=DEFAULT_FLOW_STEPS, step_size=DEFAULT_STEP_SIZE,
+                    grid=DEFAULT_GRID):
+        return _flow._flow_values(field, coords, flow_steps, step_size, grid)
+
+    def tour_length(self, route, coords):
+        return _refine._tour_length_py(route, coords)
+
+    def two_point_five_opt_sweep_until(self, route, coords, start, deadline):
+        return _refine._two_point_five_opt_sweep_py(route, coords, start, deadline)
+
+    def three_opt_sweep_until(self, route, coords, start, deadline):
+        return _refine._three_opt_sweep_py(route, coords, start, deadline)
+
+    def window_dp_sweep(self, route, coords, w=DEFAULT_DP_WINDOW):
+        return _refine._window_dp_sweep(_refine._window_dp_pass_py, route, coords, w)
+
+
+def _jit(fn, variant: str = "", **options):
+    """Compile ``fn`` with Numba, using the on-disk cache.
+
+    Cache entries are keyed by qualified name, bytecode and closure
+    contents but not by compile options, so closures that one factory
+    builds for both Numba backends are told apart by ``variant``.
+    """
+
+    if variant:
+        fn.__qualname__ = f"{fn.__qualname__}_{variant}"
+    return nb.njit(cache=True, **options)(fn)
+
+
+# ``fastmath=True`` minus ``nnan`` and ``ninf``: the Held–Karp window DP
+# marks unreached states with ``np.inf`` and compares against it, which is
+# undefined under LLVM's no-infs flag.
+_FASTMATH_WITH_INF = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+if nb:
+    from numba.extending import overload, register_jitable
+
+    # The helpers stay plain functions that Numba compiles at each call
+    # site. A captured dispatcher would pickle with a per-process id and
+    # defeat the cache; a plain function pickles by name.
+    register_jitable(fastmath=True)(_refine.dist)
+    register_jitable(fastmath=_FASTMATH_WITH_INF)(_refine._held_karp_window)
+
+    @overload(_refine._clock)
+    def _clock_nb():
+        def clock():
+            with nb.objmode(t="float64"):
+                t = time.perf_counter()
+            return t
+
+        return clock
+
+    # The k-opt sweeps are inherently sequential, so both Numba backends
+    # share one compiled copy.
+    _tour_length_nb = _jit(_refine._make_tour_length(_refine.dist), fastmath=True)
+    _two_point_five_opt_sweep_nb = _jit(
+        _refine._make_two_point_five_opt_sweep(_refine.dist, _refine._clock), fastmath=True
+    )
+    _three_opt_sweep_nb = _jit(_refine._make_three_opt_sweep(_refine.dist, _refine._clock), fastmath=True)
+
+
+class NumbaBackend(Backend):
+    name = "numba"
+    description = "single-threaded Numba kernels"
+    parallel = False
+
+    def __init__(self) -> None:
+        if nb is None:
+            return
+        variant = "parallel" if self.parallel else "serial"
+        self._diffuse_kernel = _jit(_field._make_diffuse_kernel(nb.prange), variant, parallel=self.parallel)
+        self._flow_kernel = _jit(_flow._make_flow_kernel(nb.prange), variant, parallel=self.parallel)
+        self._window_dp_pass = _jit(
+            _refine._make_window_dp_pass(_refine._held_karp_window, nb.prange),
+            variant,
+            parallel=self.parallel,
+            fastmath=_FASTMATH_WITH_INF,
+        )
+
+    def is_available(self) -> bool:
+        return nb is not None
+
+    def _diffuse(self, F, gamma, steps):
+        return self._diffuse_kernel(F, np.empty_like(F), gamma, steps)
+
+    def build_field(self, coords, grid=DEFAULT_GRID, gamma=DEFAULT_GAMMA, iter_gamma=DEFAULT_ITER_GAMMA,
+                    smooth=DEFAULT_SMOOTH, final_smooth=DEFAULT_FINAL_SMOOTH, dtype=np.float64):
+        return _field._build_field(coords, grid, gamma, iter_gamma, smooth, final_smooth, dtype, self._diffuse)
+
+    def flow_values(self, field, coords, flow_steps=DEFAULT_FLOW_STEPS, step_size=DEFAULT_STEP_SIZE,
+                    grid=DEFAULT_GRID):
+        out = np.empty(len(coords), dtype=field.dtype)
+        return self._flow_kernel(field, np.asarray(coords), flow_steps, step_size, grid, out)
+
+    def tour_length(self, route, coords):
+        return _tour_length_nb(route, coords)
+
+    def two_point_five_opt_sweep_until(self, route, coords, start, deadline):
+        return _two_point_five_opt_sweep_nb(route, coords, start, deadline)
+
+    def three_opt_sweep_until(self, route, coords, start, deadline):
+        return _three_opt_sweep_nb(route, coords, start, deadline)
+
+    def window_dp_sweep(self, route, coords, w=DEFAULT_DP_WINDOW):
+        return _refine._window_dp_sweep(self._window_dp_pass, route, coords, w)
+
+
+class NumbaParallelBackend(NumbaBackend):
+    name = "numba-parallel"
+    description = "multi-threaded Numba kernels (serial k-opt sweeps)"
+    parallel = True
+
+
+_BACKENDS: dict[str, Backend] = {}
+
+
+def register_backend(backend: Backend, replace: bool = False) -> Backend:
+    """Make ``backend`` selectable by its ``name``."""
+
+    if not backend.name:
+        raise ValueError("Backend needs a non-empty name")
+    if backend.name in _BACKENDS and not replace:
+        raise ValueError(f"Backend {backend.name!r} is already registered")
+    _BACKENDS[backend.name] = backend
+    return backend
+
+
+def registered_backends() -> dict[str, Backend]:
+    """All registered backends by name, available or not."""
+
+    return dict(_BACKENDS)
+
+
+def available_backends() -> list[str]:
+    """Names of the registered backends that can run on this host."""
+
+    return [name for name, backend in _BACKENDS.items() if backend.is_available()]
+
+
+def default_backend_name() -> str:
+    name = os.environ.get(BACKEND_ENV_VAR)
+    if name:
+        return name
+    return "numba-parallel" if _BACKENDS["numba-parallel"].is_available() else "numpy"
+
+
+def get_backend(name: str | Backend | None = None) -> Backend:
+    """Look up a backend by name; ``None`` selects the default."""
+
+    if isinstance(name, Backend):
+        return name
+    if name is None:
+        name = default_backend_name()
+    try:
+        backend = _BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}; registered: {', '.join(_BACKENDS)}") from None
+    if not backend.is_available():
+        raise ValueError(f"Backend {name!r} is not available on this host")
+    return backend
+
+
+register_backend(NumPyBackend())
+register_backend(NumbaBackend())
+register_backend(NumbaParallelBackend())
+
+from .gpu import CudaBackend  # noqa: E402  (gpu.py subclasses Backend)
+
+register_backend(CudaBackend())
+
+__all__ = [
+    "Backend",
+    "NumPyBackend",
+    "NumbaBackend",
+    "NumbaParallelBackend",
+    "register_backend",
+    "get_backend",
+    "registered_backends",
+    "available_backends",
+    "default_backend_name",
+    "BACKEND_ENV_VAR",
+]
@@ -0,0 +1,160 @@
+"""Held–Karp lower bounds for MTS–Gamma routes.
+
+Routes produced by the solver are open Hamiltonian paths. A path over N
+cities is a tour over N + 1 nodes once a dummy node at distance 0 from
+every city is added, so the classical 1-tree bound applies with the dummy
+as the special node: a minimum spanning tree over the cities plus the two
+cheapest dummy edges. Subgradient ascent on node penalties (Held–Karp)
+then tightens the bound.
+
+To keep each iteration near-linear the ascent computes spanning trees on a
+sparse candidate graph: the ``k`` nearest neighbours of every city plus
+the Delaunay edges, which contain the Euclidean MST. Penalised trees on
+that graph can be heavier than on the complete graph, so the best
+penalties are finally evaluated on the complete graph with an O(N^2)
+time, O(N) memory Prim pass. The returned value is a true lower bound.
+"""
+from __future__ import annotations
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree
+from scipy.spatial import Delaunay, QhullError, cKDTree
+
+DEFAULT_KNN = 10
+DEFAULT_BOUND_ITERS = 100
+
+
+def _candidate_edges(coords: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(coords)
+    k = min(k, n - 1)
+    _, nbrs = cKDTree(coords).query(coords, k=k + 1)
+    u = np.repeat(np.arange(n), k)
+    v = nbrs[:, 1:].ravel()
+
+    try:
+        simplices = Delaunay(coords).simplices
+        tri_u = simplices[:, [0, 1, 2]].ravel()
+        tri_v = simplices[:, [1, 2, 0]].ravel()
+    except (QhullError, ValueError):
+        # Degenerate (e.g. collinear) input: a chain in sorted order spans it.
+        order = np.lexsort((coords[:, 1], coords[:, 0]))
+        tri_u, tri_v = order[:-1], order[1:]
+
+    u = np.concatenate([u, tri_u])
+    v = np.concatenate([v, tri_v])
+    lo, hi = np.minimum(u, v), np.maximum(u, v)
+    keep = lo != hi
+    pairs = np.unique(lo[keep].astype(np.int64) * n + hi[keep])
+    lo, hi = pairs // n, pairs % n
+    cost = np.hypot(*(coords[lo] - coords[hi]).T)
+    return lo, hi, cost
+
+
+def _one_tree(
+    lo: np.ndarray, hi: np.ndarray, cost: np.ndarray, pi: np.ndarray
+) -> tuple[float, np.ndarray]:
+    n = len(pi)
+    w = cost + pi[lo] + pi[hi]
+    # csgraph treats explicit zeros as missing edges, so shift weights to be
+    # strictly positive; a constant shift does not change the tree.
+    shift = 1.0 - w.min()
+    tree = minimum_spanning_tree(coo_matrix((w + shift, (lo, hi)), shape=(n, n))).tocoo()
+    deg = np.bincount(tree.row, minlength=n) + np.bincount(tree.col, minlength=n)
+    ends = np.argpartition(pi, 1)[:2] if n > 2 else np.arange(n)
+    deg[ends] += 1
+    value = tree.data.sum() - shift * len(tree.data) + pi[ends].sum() - 2.0 * pi.sum()
+    return float(value), deg
+
+
+def _complete_one_tree(coords: np.ndarray, pi: np.ndarray) -> float:
+    """1-tree value for penalties ``pi`` on the complete graph (dense Prim)."""
+
+    n = len(coords)
+    x, y, p = coords[:, 0].copy(), coords[:, 1].copy(), pi.copy()
+    best = np.hypot(x - x[0], y - y[0]) + p + p[0]
+    dx, dy = np.empty(n), np.empty(n)
+    # Cities not yet in the tree live in x[:m], y[:m], p[:m], best[:m];
+    # a city joining the tree is swapped out with the last live one.
+    x[0], y[0], p[0], best[0] = x[-1], y[-1], p[-1], best[-1]
+    total = 0.0
+    for m in range(n - 1, 0, -1):
+        i = int(np.argmin(best[:m]))
+        total += best[i]
+        xi, yi, pii = x[i], y[i], p[i]
+        m -= 1
+        x[i], y[i], p[i], best[i] = x[m], y[m], p[m], best[m]
+        np.subtract(x[:m], xi, out=dx[:m])
+        np.subtract(y[:m], yi, out=dy[:m])
+        dx[:m] *= dx[:m]
+        dy[:m] *= dy[:m]
+        dx[:m] += dy[:m]
+        np.sqrt(dx[:m], out=dx[:m])
+        dx[:m] += p[:m]
+        dx[:m] += pii
+        np.minimum(best[:m], dx[:m], out=best[:m])
+    ends = np.argpartition(pi, 1)[:2] if n > 2 else np.arange(n)
+    return float(total + pi[ends].sum() - 2.0 * pi.sum())
+
+
+def _held_karp_ascent(
+    coords: np.ndarray, k: int, iterations: int, upper_bound: float | None
+) -> tuple[float, np.ndarray]:
+    n = len(coords)
+    lo, hi, cost = _candidate_edges(coords, k)
+    pi = np.zeros(n)
+
+    # The candidate graph contains the MST, so the unpenalised value is exact.
+    exact, deg = _one_tree(lo, hi, cost, pi)
+    best = exact
+    best_pi = pi.copy()
+    ub = upper_bound if upper_bound is not None else 2.0 * best
+    lam = 2.0
+    stale = 0
+    for _ in range(iterations):
+        g = deg - 2.0
+        norm = float(g @ g)
+        if norm == 0.0:  # the 1-tree is a path: the bound is optimal
+            break
+        pi += lam * max(ub - best, 1e-9 * ub) / norm * g
+        value, deg = _one_tree(lo, hi, cost, pi)
+        if value > best + 1e-12:
+            best = value
+            best_pi = pi.copy()
+            stale = 0
+        else:
+            stale += 1
+            if stale >= 5:
+                lam *= 0.5
+                stale = 0
+                if lam < 1e-4:
+                    break
+
+    complete = _complete_one_tree(coords, best_pi) if best > exact else exact
+    return (complete, best_pi) if complete > exact else (exact, np.zeros(n))
+
+
+def held_karp_bound(
+    coords: np.ndarray,
+    k: int = DEFAULT_KNN,
+    iterations: int = DEFAULT_BOUND_ITERS,
+    upper_bound: float | None = None,
+) -> float:
+    """Return a lower bound on the shortest open path through ``coords``.
+
+    ``upper_bound`` (any known route length) sharpens the step sizes of the
+    subgradient ascent; without it twice the MST weight is used.
+    """
+
+    coords = np.asarray(coords, dtype=np.float64)
+    if len(coords) < 2:
+        return 0.0
+    return _held_karp_ascent(coords, k, iterations, upper_bound)[0]
+
+
+def gap_pct(length: float, bound: float) -> float:
+    """Percentage by which ``length`` exceeds the lower ``bound``."""
+
+    return (length - bound) / bound * 100.0 if bound > 0 else 0.0
+
+__all__ = ["held_karp_bound", "gap_pct", "DEFAULT_KNN", "DEFAULT_BOUND_ITERS"]
@@ -0,0 +1,134 @@
+"""Compact binary checkpoints for long C4 refinements.
+
+A checkpoint is a fixed 32-byte header followed by the route as raw
+little-endian ``int32`` values (``4 * N`` bytes). The header records the
+C4 phase, the number of completed sweeps in that phase, the outer-loop
+position reached in the current sweep (and whether that sweep has
+improved the route so far), the DP window the
+schedule was run with (phase numbers depend on it), whether refinement
+used ``float32`` coordinates (compact mode) and a CRC32 of the
+coordinates, so a checkpoint cannot silently be resumed against a
+different instance or schedule. Writes go to a temporary file that is
+fsync'd and then renamed over the target, so a crash mid-write leaves the
+previous checkpoint intact.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import zlib
+
+import numpy as np
+
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+_MAGIC = b"MTSC"
+_VERSION = 3
+# magic, version, phase, dp_window, flags, iteration, position, n,
+# coords crc32, route length
+_HEADER = struct.Struct("<4sBBBBIIIId")
+_FLAG_FLOAT32 = 1
+_FLAG_IMPROVED = 2
+
+
+class Checkpoint:
+    def __init__(
+        self,
+        route: np.ndarray,
+        phase: int,
+        iteration: int,
+        length: float,
+        dp_window: int = 0,
+        dtype: np.dtype = np.float64,
+        position: int = 0,
+        improved: bool = False,
+    ) -> None:
+        self.route = route
+        self.phase = phase
+        self.iteration = iteration
+        self.length = length
+        self.dp_window = dp_window
+        self.dtype = dtype
+        self.position = position
+        self.improved = improved
+
+
+def coords_fingerprint(coords: np.ndarray) -> int:
+    """CRC32 of the coordinates as contiguous ``float64``."""
+
+    return zlib.crc32(np.ascontiguousarray(coords, dtype=np.float64).tobytes())
+
+
+def save_checkpoint(
+    path: str | os.PathLike,
+    route: np.ndarray,
+    coords: np.ndarray,
+    phase: int,
+    iteration: int,
+    dp_window: int = 0,
+    position: int = 0,
+    improved: bool = False,
+) -> None:
+    """Atomically write ``route`` and its refinement position to ``path``.
+
+    ``position`` is the outer-loop index to continue the current sweep
+    from (0 at a sweep boundary) and ``improved`` whether the sweep has
+    changed the route before it. ``float32`` ``coords`` (compact mode) are
+    flagged in the header so that ``load_checkpoint`` can validate against
+    the original coordinates.
+    """
+
+    from .refine import tour_length
+
+    route = np.ascontiguousarray(route, dtype="<i4")
+    flags = (_FLAG_FLOAT32 if coords.dtype == np.float32 else 0) | (_FLAG_IMPROVED if improved else 0)
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        phase,
+        dp_window,
+        flags,
+        iteration,
+        position,
+        len(route),
+        coords_fingerprint(coords),
+        float(tour_length(route, coords)),
+    )
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(route.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str | os.PathLike, coords: np.ndarray | None = None) -> Checkpoint:
+    """Read a checkpoint, validating it against ``coords`` when given.
+
+    For a compact checkpoint ``coords`` may be the original ``float64``
+    coordinates; they are compared after casting to ``float32``.
+    """
+
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Truncated checkpoint: {path}")
+    magic, version, phase, dp_window, flags, iteration, position, n, crc, length = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Not an MTS–Gamma checkpoint (or unsupported version): {path}")
+    if len(data) != _HEADER.size + 4 * n:
+        raise ValueError(f"Truncated checkpoint: {path}")
+    dtype = np.float32 if flags & _FLAG_FLOAT32 else np.float64
+    if coords is not None and coords_fingerprint(np.asarray(coords).astype(dtype)) != crc:
+        raise ValueError(f"Checkpoint {path} was written for different coordinates")
+    route = np.frombuffer(data, dtype="<i4", offset=_HEADER.size).astype(np.int32)
+    return Checkpoint(route, phase, iteration, length, dp_window, dtype, position, bool(flags & _FLAG_IMPROVED))
+
+__all__ = [
+    "Checkpoint",
+    "coords_fingerprint",
+    "save_checkpoint",
+    "load_checkpoint",
+    "DEFAULT_CHECKPOINT_INTERVAL",
+]
@@ -1,32 +1,28 @@
-"""CUDA-ready scaffolding for future GPU acceleration.
-
-This module only contains placeholders describing how curvature field
-construction, gradient flow, and refinement could be mapped to CUDA.
+"""CUDA backend placeholder for future GPU acceleration.
+
+``CudaBackend`` is registered under the name ``cuda`` so it shows up in
+``mtsgamma backends``, but it reports itself unavailable until kernels for
+curvature field diffusion, gradient flow and the C4 refinement sweeps are
+written (see Glyn's roadmap); until then every kernel raises
+``RuntimeError``. Implementing the abstract ``Backend`` methods here is all
+the solver needs; see ``mtsgamma.backends``.
 """
 from __future__ import annotations
 
-import numpy as np
-
-
-def curvature_field_cuda_stub(coords: np.ndarray) -> None:
-    """Placeholder for CUDA curvature field builder."""
-
-    raise NotImplementedError("CUDA kernel pending (see Glyn's roadmap)")
-
+from .backends import Backend
 
-def gradient_flow_cuda_stub(field: np.ndarray, coords: np.ndarray) -> None:
-    """Placeholder for CUDA gradient flow."""
 
-    raise NotImplementedError("CUDA kernel pending (see Glyn's roadmap)")
+class CudaBackend(Backend):
+    name = "cuda"
+    description = "CUDA kernels (not implemented yet)"
 
+    def is_available(self) -> bool:
+        return False
 
-def refinement_cuda_stub(route: np.ndarray, coords: np.ndarray) -> None:
-    """Placeholder for mapping C4 refinements to block/grid structure."""
+    def _not_implemented(self, *args, **kwargs):
+        raise RuntimeError("The cuda backend has no kernels yet")
 
-    raise NotImplementedError("CUDA kernel pending (see Glyn's roadmap)")
+    build_field = flow_values = tour_length = _not_implemented
+    two_point_five_opt_sweep_until = three_opt_sweep_until = window_dp_sweep = _not_implemented
 
-__all__ = [
-    "curvature_field_cuda_stub",
-    "gradient_flow_cuda_stub",
-    "refinement_cuda_stub",
-]
+__all__ = ["CudaBackend"]
@@ -0,0 +1,145 @@
+"""Tour merging by partition crossover (GPX).
+
+Routes are open paths, so each is closed into a cycle through a dummy node
+at distance 0 from every city. For two parents, the union of their edges
+minus the shared edges falls apart into connected components, joined to
+each other only by shared edges. If both parents pass through a component
+between the same pairs of entry points, either parent's inner paths can be
+used there without breaking the cycle. Components that fail this test are
+fused with infeasible neighbours and tested again. The child takes the
+cheaper inner paths in every feasible component and the cheaper parent
+everywhere else, so it is never longer than the better parent. Everything
+is sorting and sparse graph work, so a merge costs O(N log N).
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from .refine import tour_length
+
+
+def _cycle_edges(route: np.ndarray, coords: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(route)
+    u = np.concatenate([[n], route])
+    v = np.concatenate([route, [n]])
+    cost = np.zeros(n + 1)
+    cost[1:-1] = np.hypot(*(coords[route[1:]] - coords[route[:-1]]).T)
+    return np.minimum(u, v), np.maximum(u, v), cost
+
+
+def _walk(u: np.ndarray, v: np.ndarray, n: int) -> np.ndarray | None:
+    ends = np.concatenate([u, v])
+    others = np.concatenate([v, u])
+    if not np.all(np.bincount(ends, minlength=n + 1) == 2):
+        return None
+    nbr = others[np.argsort(ends, kind="stable")].reshape(n + 1, 2)
+
+    route = np.empty(n, dtype=np.int32)
+    prev, cur = n, nbr[n, 0]
+    for i in range(n):
+        if cur == n:
+            return None
+        route[i] = cur
+        nxt = nbr[cur, 0] if nbr[cur, 0] != prev else nbr[cur, 1]
+        prev, cur = cur, nxt
+    return route if cur == n else None
+
+
+def _portal_pairs(route: np.ndarray, comp: np.ndarray) -> np.ndarray:
+    """Rows ``(component, portal, portal)`` for each pass of the cycle through a component."""
+
+    cyc = np.concatenate([[len(route)], route])
+    seq = comp[cyc]
+    change = np.flatnonzero(seq != np.roll(seq, 1))
+    if len(change) == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    cyc = np.roll(cyc, -change[0])
+    starts = change - change[0]
+    ends = np.append(starts[1:] - 1, len(cyc) - 1)
+    first, last = cyc[starts], cyc[ends]
+    rows = np.stack([comp[first], np.minimum(first, last), np.maximum(first, last)], axis=1)
+    return rows[np.lexsort(rows.T[::-1])]
+
+
+def _feasible(a: np.ndarray, b: np.ndarray, comp: np.ndarray, n_comp: int) -> np.ndarray:
+    # A component can take either parent's inner paths if both parents pass
+    # through it the same number of times between the same pairs of portals:
+    # the cycle outside the component is then unaffected by the swap.
+    pa, pb = _portal_pairs(a, comp), _portal_pairs(b, comp)
+    feasible = np.zeros(n_comp, dtype=bool)
+    if len(pa) != len(pb):
+        return feasible
+    feasible[pa[:, 0]] = True
+    feasible[pa[np.any(pa != pb, axis=1), 0]] = False
+    return feasible
+
+
+def partition_crossover(a: np.ndarray, b: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """Merge two routes over the same cities into one no longer than either."""
+
+    n = len(coords)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    if len(a) != n or len(b) != n:
+        raise ValueError("partition_crossover expects open routes visiting every city once")
+
+    au, av, ac = _cycle_edges(a, coords)
+    bu, bv, bc = _cycle_edges(b, coords)
+    a_keys = au * (n + 1) + av
+    b_keys = bu * (n + 1) + bv
+    a_shared = np.isin(a_keys, b_keys)
+    b_shared = np.isin(b_keys, a_keys)
+    su, sv = au[a_shared], av[a_shared]
+
+    graph = coo_matrix(
+        (np.ones(int((~a_shared).sum() + (~b_shared).sum())),
+         (np.concatenate([au[~a_shared], bu[~b_shared]]), np.concatenate([av[~a_shared], bv[~b_shared]]))),
+        shape=(n + 1, n + 1),
+    )
+    n_comp, comp = connected_components(graph, directed=False)
+    feasible = _feasible(a, b, comp, n_comp)
+
+    # Fusion: infeasible components are merged with neighbouring infeasible
+    # ones along shared edges; the fused groups often pass the test.
+    fuse = ~feasible[comp[su]] & ~feasible[comp[sv]]
+    if fuse.any():
+        graph = coo_matrix(
+            (np.ones(graph.nnz + int(fuse.sum())),
+             (np.concatenate([graph.row, su[fuse]]), np.concatenate([graph.col, sv[fuse]]))),
+            shape=(n + 1, n + 1),
+        )
+        n_comp, comp = connected_components(graph, directed=False)
+        feasible = _feasible(a, b, comp, n_comp)
+
+    a_cost = np.bincount(comp[au[~a_shared]], weights=ac[~a_shared], minlength=n_comp)
+    b_cost = np.bincount(comp[bu[~b_shared]], weights=bc[~b_shared], minlength=n_comp)
+    use_b = np.where(feasible, b_cost < a_cost, b_cost[~feasible].sum() < a_cost[~feasible].sum())
+
+    take_a = ~a_shared & ~use_b[comp[au]]
+    take_b = ~b_shared & use_b[comp[bu]]
+    child = _walk(
+        np.concatenate([su, au[take_a], bu[take_b]]),
+        np.concatenate([sv, av[take_a], bv[take_b]]),
+        n,
+    )
+    if child is None:  # defensive: never expected for a valid partition
+        return (a if tour_length(a, coords) <= tour_length(b, coords) else b).astype(np.int32)
+    return child
+
+
+def merge_tours(tours: Iterable[np.ndarray], coords: np.ndarray) -> tuple[np.ndarray, float]:
+    """Fold ``partition_crossover`` over ``tours``, starting from the shortest."""
+
+    tours = sorted((np.asarray(t, dtype=np.int32) for t in tours), key=lambda t: tour_length(t, coords))
+    if not tours:
+        raise ValueError("merge_tours needs at least one tour")
+    child = tours[0]
+    for other in tours[1:]:
+        child = partition_crossover(child, other, coords)
+    return child, float(tour_length(child, coords))
+
+__all__ = ["partition_crossover", "merge_tours"]
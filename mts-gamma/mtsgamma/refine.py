@@ -1,17 +1,21 @@
-"""Route refinement routines (2.5-opt, 3-opt, C4 pipeline).
+"""Route refinement routines (2.5-opt, 3-opt, windowed DP, C4 pipeline).
 
-Numba-accelerated versions mirror the fastest C4 implementation from the
-source fragments. Pure-Python fallbacks are provided for environments
-without Numba.
+The ``_py`` functions are the pure-Python reference kernels of the
+``numpy`` backend. The ``_make_*`` factories hold the kernel sources that
+``mtsgamma.backends`` compiles with Numba, mirroring the fastest C4
+implementation from the source fragments. The public helpers take a
+``backend`` name and run on ``mtsgamma.backends.get_backend(backend)``.
 """
 from __future__ import annotations
 
+import math
+import operator
+import os
+import time
+
 import numpy as np
 
-try:  # pragma: no cover - optional dependency
-    import numba as nb
-except Exception:  # pragma: no cover
-    nb = None
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL, load_checkpoint, save_checkpoint
 
 
 def _dist_py(a: np.ndarray, b: np.ndarray) -> float:
@@ -22,186 +26,509 @@ def _tour_length_py(order: np.ndarray, coords: np.ndarray) -> float:
     return sum(_dist_py(coords[order[i]], coords[order[i + 1]]) for i in range(len(order) - 1))
 
 
-def _two_point_five_opt_py(route: np.ndarray, coords: np.ndarray) -> np.ndarray:
-    route = route.tolist()
-    improved = True
+# Sweep kernels take the outer-loop index to start from and a
+# ``time.perf_counter`` deadline. They return ``(improved, next)``, where
+# ``next`` is the outer index to resume from if the deadline passed, or -1
+# once the sweep is complete.
+
+
+def _two_point_five_opt_sweep_py(
+    route: np.ndarray, coords: np.ndarray, start: int, deadline: float
+) -> tuple[bool, int]:
     n = len(route)
-    while improved:
-        improved = False
-        for i in range(1, n - 2):
-            for j in range(i + 2, n - 1):
-                A, B = route[i - 1], route[i]
-                C, D = route[j], route[j + 1]
-                old = _dist_py(coords[A], coords[B]) + _dist_py(coords[C], coords[D])
-                new = _dist_py(coords[A], coords[C]) + _dist_py(coords[B], coords[D])
-                if new < old:
-                    route[i : j + 1] = reversed(route[i : j + 1])
-                    improved = True
-                    continue
-    return np.array(route, dtype=np.int32)
+    improved = False
+    for i in range(max(start, 1), n - 2):
+        for j in range(i + 2, n - 1):
+            A, B = route[i - 1], route[i]
+            C, D = route[j], route[j + 1]
+            old = _dist_py(coords[A], coords[B]) + _dist_py(coords[C], coords[D])
+            new = _dist_py(coords[A], coords[C]) + _dist_py(coords[B], coords[D])
+            if new < old:
+                route[i : j + 1] = route[i : j + 1][::-1].copy()
+                improved = True
+        if time.perf_counter() >= deadline:
+            return improved, i + 1
+    return improved, -1
 
 
-def _three_opt_py(route: np.ndarray, coords: np.ndarray) -> np.ndarray:
-    route = route.tolist()
+def _three_opt_sweep_py(route: np.ndarray, coords: np.ndarray, start: int, deadline: float) -> tuple[bool, int]:
     n = len(route)
-    improved = True
-    while improved:
-        improved = False
-        for i in range(0, n - 3):
-            for j in range(i + 2, n - 2):
-                for k in range(j + 2, n - 1):
-                    old = (
-                        _dist_py(coords[route[i]], coords[route[i + 1]])
-                        + _dist_py(coords[route[j]], coords[route[j + 1]])
-                        + _dist_py(coords[route[k]], coords[route[k + 1]])
-                    )
-
-                    # Option 1
-                    r1 = route.copy()
-                    r1[i + 1 : j + 1] = reversed(r1[i + 1 : j + 1])
-                    c1 = (
-                        _dist_py(coords[r1[i]], coords[r1[i + 1]])
-                        + _dist_py(coords[r1[j]], coords[r1[j + 1]])
-                        + _dist_py(coords[r1[k]], coords[r1[k + 1]])
-                    )
-
-                    # Option 2
-                    r2 = route.copy()
-                    r2[j + 1 : k + 1] = reversed(r2[j + 1 : k + 1])
-                    c2 = (
-                        _dist_py(coords[r2[i]], coords[r2[i + 1]])
-                        + _dist_py(coords[r2[j]], coords[r2[j + 1]])
-                        + _dist_py(coords[r2[k]], coords[r2[k + 1]])
-                    )
-
-                    # Option 3
-                    r3 = route.copy()
-                    r3[i + 1 : j + 1] = reversed(r3[i + 1 : j + 1])
-                    r3[j + 1 : k + 1] = reversed(r3[j + 1 : k + 1])
-                    c3 = (
-                        _dist_py(coords[r3[i]], coords[r3[i + 1]])
-                        + _dist_py(coords[r3[j]], coords[r3[j + 1]])
-                        + _dist_py(coords[r3[k]], coords[r3[k + 1]])
-                    )
-
-                    best = min(c1, c2, c3)
-                    if best < old - 1e-12:
-                        if best == c1:
-                            route = r1
-                        elif best == c2:
-                            route = r2
-                        else:
-                            route = r3
-                        improved = True
-    return np.array(route, dtype=np.int32)
-
-
-if nb:
-
-    @nb.njit(fastmath=True)
-    def dist(a, b):
-        return np.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
-
-    @nb.njit(fastmath=True)
+    improved = False
+    for i in range(start, n - 3):
+        for j in range(i + 2, n - 2):
+            for k in range(j + 2, n - 1):
+                old = (
+                    _dist_py(coords[route[i]], coords[route[i + 1]])
+                    + _dist_py(coords[route[j]], coords[route[j + 1]])
+                    + _dist_py(coords[route[k]], coords[route[k + 1]])
+                )
+
+                # Option 1
+                r1 = route.copy()
+                r1[i + 1 : j + 1] = r1[i + 1 : j + 1][::-1].copy()
+                c1 = (
+                    _dist_py(coords[r1[i]], coords[r1[i + 1]])
+                    + _dist_py(coords[r1[j]], coords[r1[j + 1]])
+                    + _dist_py(coords[r1[k]], coords[r1[k + 1]])
+                )
+
+                # Option 2
+                r2 = route.copy()
+                r2[j + 1 : k + 1] = r2[j + 1 : k + 1][::-1].copy()
+                c2 = (
+                    _dist_py(coords[r2[i]], coords[r2[i + 1]])
+                    + _dist_py(coords[r2[j]], coords[r2[j + 1]])
+                    + _dist_py(coords[r2[k]], coords[r2[k + 1]])
+                )
+
+                # Option 3
+                r3 = r1.copy()
+                r3[j + 1 : k + 1] = r3[j + 1 : k + 1][::-1].copy()
+                c3 = (
+                    _dist_py(coords[r3[i]], coords[r3[i + 1]])
+                    + _dist_py(coords[r3[j]], coords[r3[j + 1]])
+                    + _dist_py(coords[r3[k]], coords[r3[k + 1]])
+                )
+
+                best = min(c1, c2, c3)
+                if best < old - 1e-12:
+                    if best == c1:
+                        route[:] = r1
+                    elif best == c2:
+                        route[:] = r2
+                    else:
+                        route[:] = r3
+                    improved = True
+        if time.perf_counter() >= deadline:
+            return improved, i + 1
+    return improved, -1
+
+
+def dist(a: np.ndarray, b: np.ndarray) -> float:
+    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+
+
+def _clock() -> float:
+    return time.perf_counter()
+
+
+# Kernel sources for the compiled backends. ``mtsgamma.backends`` jits
+# these and compiles ``dist`` and ``_clock`` at their call sites; they are
+# plain Python until then.
+
+
+def _make_tour_length(dist):
     def tour_length(order, coords):
         s = 0.0
         for i in range(len(order) - 1):
             s += dist(coords[order[i]], coords[order[i + 1]])
         return s
 
-    @nb.njit(fastmath=True)
-    def two_point_five_opt(route, coords):
+    return tour_length
+
+
+def _make_two_point_five_opt_sweep(dist, clock):
+    def two_point_five_opt_sweep(route, coords, start, deadline):
         n = len(route)
-        improved = True
-        while improved:
-            improved = False
-            for i in range(1, n - 2):
-                A = route[i - 1]
-                B = route[i]
-                for j in range(i + 2, n - 1):
-                    C = route[j]
-                    D = route[j + 1]
-                    old = dist(coords[A], coords[B]) + dist(coords[C], coords[D])
-                    new = dist(coords[A], coords[C]) + dist(coords[B], coords[D])
-                    if new < old:
-                        l = j - i + 1
-                        tmp = route[i : j + 1].copy()
-                        for k in range(l):
-                            route[i + k] = tmp[l - 1 - k]
-                        improved = True
-        return route
-
-    @nb.njit(fastmath=True)
-    def three_opt(route, coords):
+        improved = False
+        for i in range(max(start, 1), n - 2):
+            A = route[i - 1]
+            B = route[i]
+            for j in range(i + 2, n - 1):
+                C = route[j]
+                D = route[j + 1]
+                old = dist(coords[A], coords[B]) + dist(coords[C], coords[D])
+                new = dist(coords[A], coords[C]) + dist(coords[B], coords[D])
+                if new < old:
+                    l = j - i + 1
+                    tmp = route[i : j + 1].copy()
+                    for k in range(l):
+                        route[i + k] = tmp[l - 1 - k]
+                    B = route[i]
+                    improved = True
+            if clock() >= deadline:
+                return improved, i + 1
+        return improved, -1
+
+    return two_point_five_opt_sweep
+
+
+def _make_three_opt_sweep(dist, clock):
+    def three_opt_sweep(route, coords, start, deadline):
         n = len(route)
-        improved = True
-        while improved:
-            improved = False
-            for i in range(0, n - 3):
-                A = route[i]
-                B = route[i + 1]
-                for j in range(i + 2, n - 2):
+        improved = False
+        for i in range(start, n - 3):
+            A = route[i]
+            B = route[i + 1]
+            for j in range(i + 2, n - 2):
+                C = route[j]
+                D = route[j + 1]
+                for k in range(j + 2, n - 1):
+                    E = route[k]
+                    F = route[k + 1]
+                    old = dist(coords[A], coords[B]) + dist(coords[C], coords[D]) + dist(coords[E], coords[F])
+
+                    new1 = dist(coords[A], coords[C]) + dist(coords[B], coords[D]) + dist(coords[E], coords[F])
+                    new2 = dist(coords[A], coords[B]) + dist(coords[C], coords[E]) + dist(coords[D], coords[F])
+                    new3 = dist(coords[A], coords[C]) + dist(coords[B], coords[E]) + dist(coords[D], coords[F])
+                    if new1 < old:
+                        tmp = route[i + 1 : j + 1].copy()
+                        ln = j - i
+                        for q in range(ln):
+                            route[i + 1 + q] = tmp[ln - 1 - q]
+                    elif new2 < old:
+                        tmp = route[j + 1 : k + 1].copy()
+                        ln = k - j
+                        for q in range(ln):
+                            route[j + 1 + q] = tmp[ln - 1 - q]
+                    elif new3 < old:
+                        tmp = route[i + 1 : j + 1].copy()
+                        ln = j - i
+                        for q in range(ln):
+                            route[i + 1 + q] = tmp[ln - 1 - q]
+                        tmp2 = route[j + 1 : k + 1].copy()
+                        ln2 = k - j
+                        for q in range(ln2):
+                            route[j + 1 + q] = tmp2[ln2 - 1 - q]
+                    else:
+                        continue
+                    # Segment reversals move the cities at i+1, j and j+1.
+                    B = route[i + 1]
                     C = route[j]
                     D = route[j + 1]
-                    for k in range(j + 2, n - 1):
-                        E = route[k]
-                        F = route[k + 1]
-                        old = dist(coords[A], coords[B]) + dist(coords[C], coords[D]) + dist(coords[E], coords[F])
-
-                        new1 = dist(coords[A], coords[C]) + dist(coords[B], coords[D]) + dist(coords[E], coords[F])
-                        if new1 < old:
-                            tmp = route[i + 1 : j + 1].copy()
-                            ln = j - i
-                            for q in range(ln):
-                                route[i + 1 + q] = tmp[ln - 1 - q]
-                            improved = True
-                            continue
-
-                        new2 = dist(coords[A], coords[B]) + dist(coords[C], coords[E]) + dist(coords[D], coords[F])
-                        if new2 < old:
-                            tmp = route[j + 1 : k + 1].copy()
-                            ln = k - j
-                            for q in range(ln):
-                                route[j + 1 + q] = tmp[ln - 1 - q]
-                            improved = True
-                            continue
-
-                        new3 = dist(coords[A], coords[C]) + dist(coords[B], coords[E]) + dist(coords[D], coords[F])
-                        if new3 < old:
-                            tmp = route[i + 1 : j + 1].copy()
-                            ln = j - i
-                            for q in range(ln):
-                                route[i + 1 + q] = tmp[ln - 1 - q]
-                            tmp2 = route[j + 1 : k + 1].copy()
-                            ln2 = k - j
-                            for q in range(ln2):
-                                route[j + 1 + q] = tmp2[ln2 - 1 - q]
-                            improved = True
-                            continue
-        return route
-
-    def refine_c4(order: np.ndarray, coords: np.ndarray) -> tuple[np.ndarray, float]:
-        route = two_point_five_opt(order.astype(np.int32), coords)
-        route = three_opt(route.astype(np.int32), coords)
-        route = two_point_five_opt(route.astype(np.int32), coords)
-        return route, float(tour_length(route, coords))
-
-else:
-    dist = _dist_py
-    tour_length = _tour_length_py
-    two_point_five_opt = _two_point_five_opt_py
-    three_opt = _three_opt_py
-
-    def refine_c4(order: np.ndarray, coords: np.ndarray) -> tuple[np.ndarray, float]:
-        route = two_point_five_opt(order.astype(np.int32), coords)
-        route = three_opt(route.astype(np.int32), coords)
-        route = two_point_five_opt(route.astype(np.int32), coords)
-        return route, float(tour_length(route, coords))
+                    improved = True
+            if clock() >= deadline:
+                return improved, i + 1
+        return improved, -1
+
+    return three_opt_sweep
+
+
+def _get_backend(backend):
+    from .backends import get_backend
+
+    return get_backend(backend)
+
+
+def tour_length(order: np.ndarray, coords: np.ndarray, backend: str | None = None) -> float:
+    """Length of the open path visiting ``coords`` in ``order``."""
+
+    return _get_backend(backend).tour_length(order, coords)
+
+
+def two_point_five_opt_sweep(route: np.ndarray, coords: np.ndarray, backend: str | None = None) -> bool:
+    """One in-place 2.5-opt pass over ``route``; ``True`` if it improved."""
+
+    return _get_backend(backend).two_point_five_opt_sweep(route, coords)
+
+
+def three_opt_sweep(route: np.ndarray, coords: np.ndarray, backend: str | None = None) -> bool:
+    """One in-place 3-opt pass over ``route``; ``True`` if it improved."""
+
+    return _get_backend(backend).three_opt_sweep(route, coords)
+
+
+def two_point_five_opt(route: np.ndarray, coords: np.ndarray, backend: str | None = None) -> np.ndarray:
+    """Repeat ``two_point_five_opt_sweep`` in place until no move improves."""
+
+    backend = _get_backend(backend)
+    while backend.two_point_five_opt_sweep(route, coords):
+        pass
+    return route
+
+
+def three_opt(route: np.ndarray, coords: np.ndarray, backend: str | None = None) -> np.ndarray:
+    """Repeat ``three_opt_sweep`` in place until no move improves."""
+
+    backend = _get_backend(backend)
+    while backend.three_opt_sweep(route, coords):
+        pass
+    return route
+
+
+DEFAULT_DP_WINDOW = 10
+MAX_DP_WINDOW = 16
+# Seconds between target-length checks inside a sweep.
+TARGET_CHECK_INTERVAL = 1.0
+
+
+def check_dp_window(dp_window: int) -> int:
+    """Validate a C4 ``dp_window``: 0 (no polish phase) or 3..``MAX_DP_WINDOW``."""
+
+    dp_window = operator.index(dp_window)
+    if dp_window and not 3 <= dp_window <= MAX_DP_WINDOW:
+        raise ValueError(f"dp_window must be 0 or between 3 and {MAX_DP_WINDOW}, got {dp_window}")
+    return dp_window
+
+
+def _held_karp_window(route, coords, s, w):
+    """Exact reorder of ``route[s+1 : s+w-1]`` between fixed ``route[s]`` and ``route[s+w-1]``."""
+
+    m = w - 2
+    D = np.empty((w, w))
+    for a in range(w):
+        for b in range(w):
+            pa = coords[route[s + a]]
+            pb = coords[route[s + b]]
+            D[a, b] = math.sqrt((pa[0] - pb[0]) ** 2 + (pa[1] - pb[1]) ** 2)
+
+    # Local index 0 is the fixed start, w-1 the fixed end, 1..m the interior.
+    size = 1 << m
+    dp = np.full((size, m), np.inf)
+    parent = np.full((size, m), -1, dtype=np.int8)
+    for j in range(m):
+        dp[1 << j, j] = D[0, j + 1]
+    for mask in range(1, size):
+        for j in range(m):
+            cur = dp[mask, j]
+            if not (mask >> j) & 1 or cur == np.inf:
+                continue
+            for k in range(m):
+                if (mask >> k) & 1:
+                    continue
+                nxt = mask | (1 << k)
+                c = cur + D[j + 1, k + 1]
+                if c < dp[nxt, k]:
+                    dp[nxt, k] = c
+                    parent[nxt, k] = j
+
+    full = size - 1
+    best = np.inf
+    last = -1
+    for j in range(m):
+        c = dp[full, j] + D[j + 1, w - 1]
+        if c < best:
+            best = c
+            last = j
+
+    old = 0.0
+    for a in range(w - 1):
+        old += D[a, a + 1]
+    if best >= old - 1e-9:
+        return False
+
+    interior = route[s + 1 : s + w - 1].copy()
+    mask = full
+    j = last
+    for pos in range(m - 1, -1, -1):
+        route[s + 1 + pos] = interior[j]
+        pj = int(parent[mask, j])
+        mask ^= 1 << j
+        j = pj
+    return True
+
+
+def _make_window_dp_pass(held_karp_window, prange):
+    def window_dp_pass(route, coords, w, offset):
+        # Consecutive windows share only their fixed endpoints, so their
+        # interiors are disjoint and can be re-optimised in parallel.
+        n = len(route)
+        if n - w - offset < 0:
+            return False
+        count = (n - w - offset) // (w - 1) + 1
+        improved = np.zeros(count, dtype=np.bool_)
+        for t in prange(count):
+            improved[t] = held_karp_window(route, coords, offset + t * (w - 1), w)
+        return improved.any()
+
+    return window_dp_pass
+
+
+_window_dp_pass_py = _make_window_dp_pass(_held_karp_window, range)
+
+
+def _window_dp_sweep(window_dp_pass, route, coords, w) -> bool:
+    if not 3 <= w <= MAX_DP_WINDOW:
+        raise ValueError(f"DP window must be between 3 and {MAX_DP_WINDOW}, got {w}")
+    improved = window_dp_pass(route, coords, w, 0)
+    improved |= window_dp_pass(route, coords, w, (w - 1) // 2)
+    return bool(improved)
+
+
+def window_dp_sweep(
+    route: np.ndarray, coords: np.ndarray, w: int = DEFAULT_DP_WINDOW, backend: str | None = None
+) -> bool:
+    """Slide Held–Karp windows of ``w`` cities along ``route`` in place.
+
+    Runs one pass with windows aligned at 0 and one shifted by half a
+    window so every internal edge is covered. Returns ``True`` if any
+    window improved.
+    """
+
+    return _get_backend(backend).window_dp_sweep(route, coords, w)
+
+
+def window_dp_opt(
+    route: np.ndarray, coords: np.ndarray, w: int = DEFAULT_DP_WINDOW, backend: str | None = None
+) -> np.ndarray:
+    """Repeat ``window_dp_sweep`` until no window improves."""
+
+    backend = _get_backend(backend)
+    while backend.window_dp_sweep(route, coords, w):
+        pass
+    return route
+
+
+# The C4 schedule: 2.5-opt, 3-opt, then a final 2.5-opt cleanup. Each name
+# selects the backend's ``<name>_sweep_until`` kernel (``Backend.c4_phases``).
+C4_PHASES = ("two_point_five_opt", "three_opt", "two_point_five_opt")
+
+
+def _run_c4(
+    route: np.ndarray,
+    coords: np.ndarray,
+    backend: str | None,
+    dp_window: int,
+    phase: int,
+    iteration: int,
+    position: int,
+    improved: bool,
+    target_length: float | None,
+    checkpoint_path: str | os.PathLike | None,
+    checkpoint_interval: float,
+) -> tuple[np.ndarray, float]:
+    backend = _get_backend(backend)
+    phases = backend.c4_phases(dp_window)
+
+    def reached() -> bool:
+        return target_length is not None and backend.tour_length(route, coords) <= target_length
+
+    last_saved = last_checked = time.perf_counter()
+    stopped = reached()
+    p = phase
+    for p in range(phase, len(phases)):
+        if stopped:
+            break
+        sweep = phases[p]
+        if p != phase:
+            iteration, position, improved = 0, 0, False
+        while True:
+            # Sweeps return mid-way once a checkpoint or target check is
+            # due, so both hold even when one sweep takes minutes.
+            deadline = math.inf
+            if checkpoint_path is not None:
+                deadline = last_saved + checkpoint_interval
+            if target_length is not None:
+                deadline = min(deadline, last_checked + TARGET_CHECK_INTERVAL)
+            gained, position = sweep(route, coords, position, deadline)
+            improved |= gained
+            if position < 0:
+                if not improved:
+                    break
+                iteration += 1
+                position, improved = 0, False
+            if reached():
+                stopped = True
+                break
+            last_checked = time.perf_counter()
+            if checkpoint_path is not None and last_checked >= last_saved + checkpoint_interval:
+                save_checkpoint(checkpoint_path, route, coords, p, iteration, dp_window, position, improved)
+                last_saved = time.perf_counter()
+        if stopped:
+            break
+    if checkpoint_path is not None:
+        # An early stop records its position so a later resume can go further.
+        if stopped:
+            save_checkpoint(checkpoint_path, route, coords, p, iteration, dp_window, position, improved)
+        else:
+            save_checkpoint(checkpoint_path, route, coords, max(phase, len(phases)), 0, dp_window)
+    return route, float(backend.tour_length(route, coords))
+
+
+def refine_c4(
+    order: np.ndarray,
+    coords: np.ndarray,
+    dp_window: int = 0,
+    target_length: float | None = None,
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    copy: bool = True,
+    backend: str | None = None,
+) -> tuple[np.ndarray, float]:
+    """Run the C4 refinement schedule on ``order``.
+
+    All phases work in place on one ``int32`` route buffer. With
+    ``copy=False`` an ``int32`` ``order`` is itself used as that buffer.
+
+    A non-zero ``dp_window`` appends a polishing phase that re-optimises
+    windows of that many consecutive cities exactly (``window_dp_sweep``).
+
+    With ``target_length`` set, refinement stops as soon as the route is
+    at that length or below: before the first sweep, after an improving
+    sweep, or within about ``TARGET_CHECK_INTERVAL`` seconds during one.
+
+    With ``checkpoint_path`` set, the current route, phase, sweep count and
+    position within the sweep are written atomically about once every
+    ``checkpoint_interval`` seconds (a sweep in progress stops at the
+    next outer-loop step and later continues from it) and once more on
+    completion, so an interrupted run can continue with ``resume_c4``.
+
+    ``backend`` selects the sweep kernels by name (see
+    ``mtsgamma.backends``); ``None`` uses the default backend.
+    """
+
+    dp_window = check_dp_window(dp_window)
+    route = order.astype(np.int32, copy=copy)
+    return _run_c4(
+        route, coords, backend, dp_window, 0, 0, 0, False, target_length, checkpoint_path, checkpoint_interval
+    )
+
+
+def resume_c4(
+    coords: np.ndarray,
+    checkpoint_path: str | os.PathLike,
+    dp_window: int | None = None,
+    target_length: float | None = None,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    backend: str | None = None,
+) -> tuple[np.ndarray, float]:
+    """Continue a C4 refinement from the checkpoint at ``checkpoint_path``.
+
+    ``dp_window`` defaults to the value the checkpoint was written with;
+    a different value is rejected, since phase numbers depend on it.
+
+    A checkpoint from a compact run refines ``float32`` copies of
+    ``coords``; the returned length is measured on ``coords`` as given.
+    """
+
+    ckpt = load_checkpoint(checkpoint_path, coords)
+    if dp_window is None:
+        dp_window = ckpt.dp_window
+    elif check_dp_window(dp_window) != ckpt.dp_window:
+        raise ValueError(
+            f"Checkpoint {checkpoint_path} was written with dp_window={ckpt.dp_window}, not {dp_window}"
+        )
+    work = np.ascontiguousarray(coords, dtype=ckpt.dtype)
+    route, length = _run_c4(
+        ckpt.route,
+        work,
+        backend,
+        dp_window,
+        ckpt.phase,
+        ckpt.iteration,
+        ckpt.position,
+        ckpt.improved,
+        target_length,
+        checkpoint_path,
+        checkpoint_interval,
+    )
+    if work.dtype != np.asarray(coords).dtype:
+        length = float(tour_length(route, coords, backend))
+    return route, length
 
 __all__ = [
     "dist",
     "tour_length",
     "two_point_five_opt",
     "three_opt",
+    "two_point_five_opt_sweep",
+    "three_opt_sweep",
+    "window_dp_sweep",
+    "window_dp_opt",
     "refine_c4",
+    "resume_c4",
+    "C4_PHASES",
+    "check_dp_window",
+    "DEFAULT_DP_WINDOW",
+    "MAX_DP_WINDOW",
 ]
@@ -0,0 +1,425 @@
+"""Long-running local solve service for MTS–Gamma.
+
+``mtsgamma solve`` pays for imports and numba compilation on every call.
+The service keeps a pool of warm worker processes (kernels compiled once
+per worker) and answers JSON requests over a minimal HTTP/1.1 interface:
+
+- ``POST /solve`` with ``{"coords": [[x, y], ...], "params": {...},
+  "time_limit": 30.0, "id": "optional"}`` returns the refined route.
+- ``POST /cancel/<id>`` cancels a queued or running request.
+- ``GET /metrics`` reports queue depth, in-flight work and latencies.
+
+Requests queue in arrival order. ``time_limit`` is measured from the moment
+a request is queued; a worker that overruns it (or whose request is
+cancelled) is killed and respawned so the pool never stalls. A worker that
+dies mid-solve fails its request with ``"worker died"`` and is respawned.
+A replacement that fails to start is logged and retried with backoff.
+Kernels come from Numba's on-disk cache, so a respawn does not recompile.
+
+Parallelism comes from the pool, so workers default to the single-threaded
+``numba`` backend (``numpy`` without Numba) rather than ``numba-parallel``,
+which would start one thread per core in every worker. Requests that name
+a ``backend`` in their params still get it.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import concurrent.futures
+import json
+import logging
+import multiprocessing as mp
+import os
+import time
+import uuid
+
+import numpy as np
+
+from .backends import BACKEND_ENV_VAR, available_backends, get_backend
+from .solver import SolverParams
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_TIME_LIMIT = 60.0
+LATENCY_WINDOW = 1024
+RESPAWN_BACKOFF = (0.5, 30.0)
+
+_log = logging.getLogger(__name__)
+
+_WARMUP_PARAMS = dict(grid=64, iter_gamma=2, flow_steps=2)
+
+
+def _default_worker_backend() -> str:
+    return "numba" if "numba" in available_backends() else "numpy"
+
+
+def _worker_main(conn, backend: str) -> None:
+    """Worker process loop: warm the kernels, then solve until told to stop."""
+
+    from .solver import mts_gamma_C4
+
+    # Every default backend lookup in this process resolves to ``backend``.
+    os.environ[BACKEND_ENV_VAR] = backend
+
+    warm = np.random.default_rng(0).random((16, 2)) * 60
+    mts_gamma_C4(warm, params=SolverParams(**_WARMUP_PARAMS))
+    conn.send(("ready", None, None))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+        coords, params = msg
+        try:
+            route, length = mts_gamma_C4(coords, params=params)
+            conn.send(("ok", route.tolist(), float(length)))
+        except Exception as exc:  # report solver failures to the caller
+            conn.send(("error", repr(exc), None))
+    conn.close()
+
+
+class _Worker:
+    """A single warm solver process and its pipe."""
+
+    def __init__(self, ctx, executor: concurrent.futures.Executor, backend: str) -> None:
+        self._ctx = ctx
+        self._executor = executor
+        self.backend = backend
+        self.process = None
+        self.conn = None
+
+    async def start(self) -> None:
+        parent, child = self._ctx.Pipe()
+        self.process = self._ctx.Process(target=_worker_main, args=(child, self.backend), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+        await self._recv()
+
+    async def _recv(self):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.conn.recv)
+
+    async def solve(self, coords: np.ndarray, params: SolverParams):
+        self.conn.send((coords, params))
+        return await self._recv()
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            self.process.kill()
+        if self.process is not None:
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+
+    def stop(self) -> None:
+        if self.conn is not None and self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout=5)
+        self.kill()
+
+
+class _Job:
+    def __init__(self, job_id: str, coords: np.ndarray, params: SolverParams, time_limit: float) -> None:
+        self.id = job_id
+        self.coords = coords
+        self.params = params
+        self.time_limit = time_limit
+        self.enqueued = time.perf_counter()
+        self.state = "queued"
+        self.task: asyncio.Task | None = None
+        self.result: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class SolveService:
+    """Queue of solve requests served by a pool of warm worker processes."""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        default_time_limit: float = DEFAULT_TIME_LIMIT,
+        backend: str | None = None,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.default_time_limit = default_time_limit
+        self.backend = get_backend(backend or _default_worker_backend()).name
+        self._ctx = mp.get_context("spawn")
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self._pool: list[_Worker] = []
+        self._dispatchers: list[asyncio.Task] = []
+        self._queue: asyncio.Queue | None = None
+        self._jobs: dict[str, _Job] = {}
+        self._latencies: collections.deque = collections.deque(maxlen=LATENCY_WINDOW)
+        self._counts = collections.Counter()
+        self._started = 0.0
+
+    async def start(self) -> None:
+        """Spawn and warm the worker pool."""
+
+        self._queue = asyncio.Queue()
+        self._pool = [_Worker(self._ctx, self._executor, self.backend) for _ in range(self.workers)]
+        await asyncio.gather(*(w.start() for w in self._pool))
+        self._dispatchers = [asyncio.create_task(self._dispatch(w)) for w in self._pool]
+        self._started = time.perf_counter()
+
+    async def stop(self) -> None:
+        """Cancel outstanding work and shut the workers down."""
+
+        for job in list(self._jobs.values()):
+            if job.task is not None:
+                job.task.cancel()
+            self._finish(job, "cancelled")
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        for w in self._pool:
+            w.stop()
+        self._executor.shutdown(wait=False)
+
+    async def submit(
+        self,
+        coords: np.ndarray,
+        params: SolverParams | None = None,
+        time_limit: float | None = None,
+        request_id: str | None = None,
+    ) -> dict:
+        """Queue a request and wait for its result dictionary."""
+
+        job_id = request_id or uuid.uuid4().hex
+        if job_id in self._jobs:
+            raise ValueError(f"Duplicate request id: {job_id}")
+        # Cancelled or expired jobs stay in ``_queue`` until a dispatcher
+        # skips them, so admission counts the live queued jobs instead.
+        if self._queue_depth() >= self.queue_size:
+            self._counts["rejected"] += 1
+            return {"id": job_id, "status": "rejected", "error": "queue full"}
+        limit = self.default_time_limit if time_limit is None else float(time_limit)
+        job = _Job(job_id, coords, params or SolverParams(), limit)
+        self._jobs[job_id] = job
+        self._queue.put_nowait(job)
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.result), timeout=max(limit, 0.0))
+        except asyncio.TimeoutError:
+            # A running job is timed out by its dispatcher, which also
+            # replaces the worker; only a job still waiting expires here.
+            if job.state == "queued":
+                self._finish(job, "timeout", error="time limit expired while queued")
+            return await job.result
+        finally:
+            self._jobs.pop(job_id, None)
+
+    def cancel(self, request_id: str) -> bool:
+        """Cancel a queued or running request. Returns ``False`` if unknown."""
+
+        job = self._jobs.get(request_id)
+        if job is None or job.result.done():
+            return False
+        if job.state == "running" and job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, "cancelled")
+        return True
+
+    def metrics(self) -> dict:
+        """Snapshot of queue depth, in-flight work, counters and latency."""
+
+        lat = np.array(self._latencies, dtype=np.float64)
+        uptime = time.perf_counter() - self._started if self._started else 0.0
+        states = collections.Counter(job.state for job in self._jobs.values())
+        return {
+            "workers": self.workers,
+            "backend": self.backend,
+            "queue_depth": states["queued"],
+            "in_flight": states["running"],
+            "completed": self._counts["ok"],
+            "failed": self._counts["error"],
+            "cancelled": self._counts["cancelled"],
+            "timed_out": self._counts["timeout"],
+            "rejected": self._counts["rejected"],
+            "latency_p50": float(np.percentile(lat, 50)) if lat.size else None,
+            "latency_p99": float(np.percentile(lat, 99)) if lat.size else None,
+            "latency_mean": float(lat.mean()) if lat.size else None,
+            "throughput": self._counts["ok"] / uptime if uptime > 0 else 0.0,
+        }
+
+    def _queue_depth(self) -> int:
+        return sum(job.state == "queued" for job in self._jobs.values())
+
+    def _finish(self, job: _Job, status: str, **fields) -> None:
+        if job.result.done():
+            return
+        latency = time.perf_counter() - job.enqueued
+        job.state = status
+        self._counts[status] += 1
+        if status == "ok":
+            self._latencies.append(latency)
+        job.result.set_result({"id": job.id, "status": status, "latency": latency, **fields})
+
+    async def _dispatch(self, worker: _Worker) -> None:
+        while True:
+            job = await self._queue.get()
+            if job.result.done():
+                continue
+            remaining = job.time_limit - (time.perf_counter() - job.enqueued)
+            if remaining <= 0:
+                self._finish(job, "timeout", error="time limit expired while queued")
+                continue
+
+            job.state = "running"
+            job.task = asyncio.create_task(worker.solve(job.coords, job.params))
+            done, _ = await asyncio.wait({job.task}, timeout=remaining)
+
+            if job.task.cancelled():
+                self._finish(job, "cancelled")
+            elif not done:
+                job.task.cancel()
+                self._finish(job, "timeout", error=f"exceeded time limit of {job.time_limit}s")
+            else:
+                try:
+                    status, payload, length = job.task.result()
+                except (EOFError, OSError):
+                    # The process died mid-solve (OOM kill, segfault, ...).
+                    self._finish(job, "error", error="worker died")
+                else:
+                    if status == "ok":
+                        self._finish(job, "ok", route=payload, length=length)
+                    else:
+                        self._finish(job, "error", error=payload)
+                    continue
+
+            # The worker is dead or still busy with an abandoned request:
+            # replace it.
+            await self._respawn(worker)
+
+    async def _respawn(self, worker: _Worker) -> None:
+        """Replace ``worker`` with a fresh process, retrying failed starts."""
+
+        delay, max_delay = RESPAWN_BACKOFF
+        while True:
+            worker.kill()
+            try:
+                await worker.start()
+                return
+            except (EOFError, OSError) as exc:
+                _log.warning("solver worker failed to start (%r); retrying in %.1fs", exc, delay)
+            await asyncio.sleep(delay)
+            delay = min(2 * delay, max_delay)
+
+
+def _parse_request(body: dict) -> tuple[np.ndarray, SolverParams, float | None, str | None]:
+    coords = np.asarray(body.get("coords"), dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 2 or coords.shape[0] < 2:
+        raise ValueError("coords must be a list of at least two [x, y] pairs")
+    params = SolverParams(**body.get("params", {}))
+    return coords, params, body.get("time_limit"), body.get("id")
+
+
+async def _read_http(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    method, path, _ = request_line.split(" ", 2)
+    length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length) if length else b""
+    return method, path, body
+
+
+def _write_http(writer: asyncio.StreamWriter, status: int, payload: dict) -> None:
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}[status]
+    data = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode()
+        + data
+    )
+
+
+async def _handle(service: SolveService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        method, path, body = await _read_http(reader)
+        if method == "GET" and path == "/metrics":
+            _write_http(writer, 200, service.metrics())
+        elif method == "POST" and path == "/solve":
+            try:
+                coords, params, limit, job_id = _parse_request(json.loads(body or b"{}"))
+                result = await service.submit(coords, params, time_limit=limit, request_id=job_id)
+            except (ValueError, TypeError) as exc:
+                _write_http(writer, 400, {"status": "error", "error": str(exc)})
+            else:
+                _write_http(writer, 503 if result["status"] == "rejected" else 200, result)
+        elif method == "POST" and path.startswith("/cancel/"):
+            job_id = path[len("/cancel/") :]
+            _write_http(writer, 200, {"id": job_id, "cancelled": service.cancel(job_id)})
+        else:
+            _write_http(writer, 404, {"status": "error", "error": f"no route for {method} {path}"})
+        await writer.drain()
+    except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(
+    service: SolveService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+) -> asyncio.AbstractServer:
+    """Start the HTTP front end for an already started ``service``."""
+
+    return await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    default_time_limit: float = DEFAULT_TIME_LIMIT,
+    backend: str | None = None,
+) -> None:
+    """Run the solve service until interrupted."""
+
+    async def _main() -> None:
+        service = SolveService(
+            workers=workers, queue_size=queue_size, default_time_limit=default_time_limit, backend=backend
+        )
+        await service.start()
+        server = await start_server(service, host, port)
+        print(
+            f"mtsgamma serving on http://{host}:{port} with {workers} warm {service.backend} workers",
+            flush=True,
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+__all__ = [
+    "SolveService",
+    "start_server",
+    "serve",
+    "DEFAULT_HOST",
+    "DEFAULT_PORT",
+    "DEFAULT_WORKERS",
+    "DEFAULT_QUEUE_SIZE",
+    "DEFAULT_TIME_LIMIT",
+]
@@ -1,12 +1,16 @@
 """End-to-end MTS–Gamma solver with C4 refinement."""
 from __future__ import annotations
 
+import os
 import time
 import numpy as np
 
-from .field import build_field, DEFAULT_GRID, DEFAULT_GAMMA, DEFAULT_ITER_GAMMA, DEFAULT_SMOOTH
-from .flow import gradient_flow, DEFAULT_FLOW_STEPS, DEFAULT_STEP_SIZE
-from .refine import refine_c4, tour_length
+from .field import DEFAULT_GRID, DEFAULT_GAMMA, DEFAULT_ITER_GAMMA, DEFAULT_SMOOTH
+from .flow import DEFAULT_FLOW_STEPS, DEFAULT_STEP_SIZE
+from .refine import check_dp_window, refine_c4, tour_length
+from .backends import get_backend
+from .checkpoint import DEFAULT_CHECKPOINT_INTERVAL
+from .bound import held_karp_bound, gap_pct
 from .christofides import christofides_route
 
 
@@ -19,6 +23,10 @@ class SolverParams:
         smooth: float = DEFAULT_SMOOTH,
         flow_steps: int = DEFAULT_FLOW_STEPS,
         step_size: float = DEFAULT_STEP_SIZE,
+        dp_window: int = 0,
+        target_gap_pct: float | None = None,
+        compact: bool = False,
+        backend: str | None = None,
     ) -> None:
         self.grid = grid
         self.gamma = gamma
@@ -26,25 +34,77 @@ class SolverParams:
         self.smooth = smooth
         self.flow_steps = flow_steps
         self.step_size = step_size
+        self.dp_window = check_dp_window(dp_window)
+        self.target_gap_pct = target_gap_pct
+        self.compact = compact
+        self.backend = backend
 
 
-def mts_gamma_C4(coords: np.ndarray, params: SolverParams | None = None) -> tuple[np.ndarray, float]:
-    """Run the full MTS–Gamma C4 pipeline and return the refined tour and length."""
+def mts_gamma_C4(
+    coords: np.ndarray,
+    params: SolverParams | None = None,
+    checkpoint_path: str | os.PathLike | None = None,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+    lower_bound: float | None = None,
+) -> tuple[np.ndarray, float]:
+    """Run the full MTS–Gamma C4 pipeline and return the refined tour and length.
+
+    ``checkpoint_path`` enables periodic refinement checkpoints; see
+    ``refine_c4`` and ``resume_c4``. Checkpoints of a ``params.compact``
+    run record that, and ``resume_c4`` casts the coordinates to match.
+
+    When ``params.target_gap_pct`` is set, refinement stops as soon as the
+    route is within that percentage of ``lower_bound`` (computed with
+    ``held_karp_bound(coords)`` if not supplied).
+
+    All field, flow and refinement kernels come from the backend named by
+    ``params.backend`` (see ``mtsgamma.backends``).
+    """
 
     p = params or SolverParams()
-    field = build_field(
-        coords,
+    backend = get_backend(p.backend)
+    # Compact mode: float32 field, gradients and refinement coordinates.
+    work = np.ascontiguousarray(coords, dtype=np.float32) if p.compact else coords
+    field = backend.build_field(
+        work,
         grid=p.grid,
         gamma=p.gamma,
         iter_gamma=p.iter_gamma,
         smooth=p.smooth,
+        dtype=np.float32 if p.compact else np.float64,
     )
-    order = gradient_flow(field, coords, flow_steps=p.flow_steps, step_size=p.step_size, grid=p.grid)
-    return refine_c4(order.astype(np.int32), coords)
+    order = backend.gradient_flow(field, work, flow_steps=p.flow_steps, step_size=p.step_size, grid=p.grid)
+    del field
+    order = order.astype(np.int32)
+
+    target = None
+    if p.target_gap_pct is not None:
+        if lower_bound is None:
+            # The raw flow order is several times the optimum; as an upper
+            # bound it oversizes the ascent steps and weakens the bound.
+            lower_bound = held_karp_bound(coords)
+        target = lower_bound * (1.0 + p.target_gap_pct / 100.0)
+
+    route, length = refine_c4(
+        order,
+        work,
+        dp_window=p.dp_window,
+        target_length=target,
+        checkpoint_path=checkpoint_path,
+        checkpoint_interval=checkpoint_interval,
+        copy=False,
+        backend=backend.name,
+    )
+    if p.compact:
+        length = float(backend.tour_length(route, coords))
+    return route, length
 
 
 def run_test(N: int = 500, seed: int | None = None, params: SolverParams | None = None) -> dict[str, float]:
-    """Generate random coordinates and compare Christofides vs MTS–Gamma."""
+    """Generate random coordinates and compare Christofides vs MTS–Gamma.
+
+    Both lengths are also reported as a gap to the Held–Karp lower bound.
+    """
 
     if seed is not None:
         np.random.seed(seed)
@@ -56,15 +116,23 @@ def run_test(N: int = 500, seed: int | None = None, params: SolverParams | None
     c_time = time.time() - start
 
     start = time.time()
-    mts_route, mts_len = mts_gamma_C4(coords, params=params)
+    bound = held_karp_bound(coords, upper_bound=christofides_len)
+    b_time = time.time() - start
+
+    start = time.time()
+    mts_route, mts_len = mts_gamma_C4(coords, params=params, lower_bound=bound)
     m_time = time.time() - start
 
     return {
         "christofides": christofides_len,
         "mts_gamma": mts_len,
         "improvement_pct": (christofides_len - mts_len) / christofides_len * 100.0,
+        "lower_bound": bound,
+        "christofides_gap_pct": gap_pct(christofides_len, bound),
+        "mts_gap_pct": gap_pct(mts_len, bound),
         "christofides_time": c_time,
         "mts_time": m_time,
+        "bound_time": b_time,
     }
 
 __all__ = ["mts_gamma_C4", "run_test", "SolverParams"]
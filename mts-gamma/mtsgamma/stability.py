@@ -11,6 +11,7 @@ from .solver import mts_gamma_C4
 from .christofides import christofides_route
 from .refine import tour_length
 from .field import DEFAULT_GRID
+from .bound import held_karp_bound, gap_pct
 
 
 DEFAULT_SIZES = [100, 300, 500, 1000]
@@ -22,10 +23,25 @@ def run_stability_tests(
     seeds: int = DEFAULT_SEEDS,
     grid: int = DEFAULT_GRID,
     csv_path: str = "mts_gamma_stability.csv",
+    bound: bool = True,
 ) -> None:
-    """Execute multi-seed comparisons and write CSV."""
+    """Execute multi-seed comparisons and write CSV.
 
-    rows = [["N", "seed", "christofides", "mts_gamma", "improvement_pct", "runtime_sec"]]
+    ``bound=False`` skips the Held–Karp bound (a dense O(N²) pass) and
+    leaves the bound and gap columns empty.
+    """
+
+    rows = [[
+        "N",
+        "seed",
+        "christofides",
+        "mts_gamma",
+        "improvement_pct",
+        "lower_bound",
+        "christofides_gap_pct",
+        "mts_gap_pct",
+        "runtime_sec",
+    ]]
 
     for N in sizes:
         for seed in range(seeds):
@@ -42,7 +58,12 @@ def run_stability_tests(
             m_time = time.time() - start
 
             imp = (c_len - m_len) / c_len * 100.0
-            rows.append([N, seed, c_len, m_len, imp, c_time + m_time])
+            if bound:
+                lb = held_karp_bound(coords, upper_bound=m_len)
+                gaps = [lb, gap_pct(c_len, lb), gap_pct(m_len, lb)]
+            else:
+                gaps = ["", "", ""]
+            rows.append([N, seed, c_len, m_len, imp, *gaps, c_time + m_time])
 
     with open(csv_path, "w", newline="") as f:
         csv.writer(f).writerows(rows)
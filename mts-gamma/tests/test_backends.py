@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+from mtsgamma.backends import Backend, available_backends, get_backend, registered_backends
+from mtsgamma.refine import C4_PHASES, refine_c4
+from mtsgamma.solver import SolverParams, mts_gamma_C4
+
+BACKENDS = available_backends()
+REFERENCE = get_backend("numpy")
+
+
+def _instance(n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 2)) * 60, rng.permutation(n).astype(np.int32)
+
+
+def test_registry_rejects_unknown_and_unavailable():
+    assert {"numpy", "cuda"} <= set(registered_backends())
+    assert "numpy" in BACKENDS
+    with pytest.raises(ValueError):
+        get_backend("no-such-backend")
+    with pytest.raises(ValueError):
+        get_backend("cuda")
+
+
+def test_backend_kernels_are_abstract():
+    class Partial(Backend):
+        name = "partial"
+
+        def tour_length(self, route, coords):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        Partial()
+    coords, route = _instance()
+    with pytest.raises(RuntimeError):
+        registered_backends()["cuda"].tour_length(route, coords)
+    assert len(REFERENCE.c4_phases()) == len(C4_PHASES)
+    assert len(REFERENCE.c4_phases(8)) == len(C4_PHASES) + 1
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_field_matches_reference(name, dtype):
+    coords, _ = _instance()
+    field = get_backend(name).build_field(coords, grid=64, iter_gamma=40, dtype=dtype)
+    expected = REFERENCE.build_field(coords, grid=64, iter_gamma=40, dtype=dtype)
+    assert field.dtype == dtype
+    np.testing.assert_allclose(field, expected, rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_flow_matches_reference(name):
+    coords, _ = _instance()
+    field = REFERENCE.build_field(coords, grid=64, iter_gamma=40)
+    backend = get_backend(name)
+    np.testing.assert_allclose(
+        backend.flow_values(field, coords, flow_steps=50, grid=64),
+        REFERENCE.flow_values(field, coords, flow_steps=50, grid=64),
+        rtol=1e-9,
+    )
+    order = backend.gradient_flow(field, coords, flow_steps=50, grid=64)
+    assert sorted(order.tolist()) == list(range(len(coords)))
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("sweep", ["two_point_five_opt_sweep", "three_opt_sweep", "window_dp_sweep"])
+def test_sweeps_keep_permutation_and_never_worsen(name, sweep):
+    coords, route = _instance()
+    backend = get_backend(name)
+    before = backend.tour_length(route, coords)
+    assert abs(before - REFERENCE.tour_length(route, coords)) < 1e-9
+    assert getattr(backend, sweep)(route, coords)
+    assert sorted(route.tolist()) == list(range(len(coords)))
+    assert backend.tour_length(route, coords) < before
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("sweep", ["two_point_five_opt_sweep", "three_opt_sweep"])
+def test_sweep_stops_at_deadline_and_resumes(name, sweep):
+    coords, route = _instance()
+    backend = get_backend(name)
+    expected = route.copy()
+    assert getattr(backend, sweep)(expected, coords)
+
+    # A deadline in the past stops after every outer step.
+    until = getattr(backend, f"{sweep}_until")
+    improved, position = until(route, coords, 0, 0.0)
+    steps = 1
+    while position >= 0:
+        gained, position = until(route, coords, position, 0.0)
+        improved |= gained
+        steps += 1
+    assert improved
+    assert steps > 10
+    assert np.array_equal(route, expected)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_window_dp_matches_reference(name):
+    coords, route = _instance()
+    expected = route.copy()
+    REFERENCE.window_dp_sweep(expected, coords, 8)
+    get_backend(name).window_dp_sweep(route, coords, 8)
+    assert abs(REFERENCE.tour_length(route, coords) - REFERENCE.tour_length(expected, coords)) < 1e-9
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_pipeline_runs_on_backend(name):
+    coords, order = _instance(n=20)
+    route, length = refine_c4(order, coords, dp_window=6, backend=name)
+    assert sorted(route.tolist()) == list(range(20))
+    assert length <= REFERENCE.tour_length(order, coords) + 1e-9
+
+    route, _ = mts_gamma_C4(coords, SolverParams(grid=64, iter_gamma=20, flow_steps=50, backend=name))
+    assert sorted(route.tolist()) == list(range(20))
@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+from scipy.sparse.csgraph import minimum_spanning_tree
+from mtsgamma.bound import _candidate_edges, _held_karp_ascent, _one_tree, held_karp_bound
+from mtsgamma import refine
+from mtsgamma.refine import refine_c4, tour_length, two_point_five_opt_sweep
+from mtsgamma.solver import SolverParams, mts_gamma_C4
+
+
+def test_bound_between_mst_and_optimal_path():
+    coords = np.random.default_rng(1).random((8, 2)) * 100
+    optimal = min(tour_length(np.array(p, dtype=np.int32), coords) for p in itertools.permutations(range(8)))
+    lo, hi, cost = _candidate_edges(coords, 10)
+    mst, _ = _one_tree(lo, hi, cost, np.zeros(8))
+    bound = held_karp_bound(coords)
+    assert mst - 1e-9 <= bound <= optimal + 1e-9
+
+
+def test_bound_holds_on_complete_graph():
+    # N large enough that the k-NN + Delaunay graph is far from complete.
+    n = 800
+    coords = np.random.default_rng(0).random((n, 2)) * 508
+    bound, pi = _held_karp_ascent(coords, 10, 100, None)
+    assert bound == held_karp_bound(coords)
+
+    d = np.hypot(*(coords[:, None, :] - coords[None, :, :]).transpose(2, 0, 1))
+    w = d + pi[:, None] + pi[None, :]
+    shift = 1.0 - w.min()
+    tree = minimum_spanning_tree(np.triu(w + shift, 1))
+    ends = np.argsort(pi)[:2]
+    one_tree = tree.sum() - shift * (n - 1) + pi[ends].sum() - 2.0 * pi.sum()
+    assert bound <= one_tree + 1e-6
+
+
+def test_refine_stops_at_target_length():
+    rng = np.random.default_rng(2)
+    coords = rng.random((60, 2)) * 100
+    order = rng.permutation(60).astype(np.int32)
+    _, full_len = refine_c4(order, coords)
+    start_len = tour_length(order, coords)
+    early, early_len = refine_c4(order, coords, target_length=start_len)
+    assert np.array_equal(early, order)
+    assert early_len == start_len
+
+    target = (start_len + full_len) / 2
+    _, early_len = refine_c4(order, coords, target_length=target)
+    assert full_len <= early_len <= target
+
+
+def test_refine_checks_target_inside_a_sweep(monkeypatch):
+    monkeypatch.setattr(refine, "TARGET_CHECK_INTERVAL", 0.0)
+    rng = np.random.default_rng(2)
+    coords = rng.random((60, 2)) * 100
+    order = rng.permutation(60).astype(np.int32)
+    one_sweep = order.copy()
+    two_point_five_opt_sweep(one_sweep, coords)
+
+    # Reachable a few moves into the first sweep; stopping only between
+    # sweeps would overshoot to the one-sweep length.
+    target = tour_length(order, coords) - 1e-6
+    _, early_len = refine_c4(order, coords, target_length=target)
+    assert early_len <= target
+    assert early_len > tour_length(one_sweep, coords)
+
+
+def test_solver_target_uses_unbiased_bound():
+    # The automatic bound must not be steered by the (poor) flow order.
+    coords = np.random.default_rng(7).random((300, 2)) * 120
+    params = SolverParams(grid=128, target_gap_pct=15.0)
+    route, length = mts_gamma_C4(coords, params)
+    expected, expected_len = mts_gamma_C4(coords, params, lower_bound=held_karp_bound(coords))
+    assert np.array_equal(route, expected)
+    assert length == expected_len
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from mtsgamma.backends import get_backend
+from mtsgamma.checkpoint import load_checkpoint, save_checkpoint
+from mtsgamma.refine import refine_c4, resume_c4, tour_length
+from mtsgamma.solver import SolverParams, mts_gamma_C4
+
+
+def test_checkpoint_resume_matches_full_run(tmp_path):
+    rng = np.random.default_rng(3)
+    coords = rng.random((40, 2)) * 100
+    order = rng.permutation(40).astype(np.int32)
+    path = tmp_path / "run.ckpt"
+
+    save_checkpoint(path, order, coords, phase=0, iteration=0)
+    route, length = resume_c4(coords, path, checkpoint_interval=0.0)
+    expected, expected_len = refine_c4(order, coords)
+    assert np.array_equal(route, expected)
+    assert length == pytest.approx(expected_len)
+
+    ckpt = load_checkpoint(path, coords)
+    assert ckpt.phase == 3
+    assert np.array_equal(ckpt.route, route)
+    assert ckpt.length == pytest.approx(tour_length(route, coords))
+
+    with pytest.raises(ValueError):
+        load_checkpoint(path, coords + 1.0)
+
+
+def test_resume_mid_sweep_matches_full_run(tmp_path):
+    rng = np.random.default_rng(6)
+    coords = rng.random((60, 2)) * 100
+    order = rng.permutation(60).astype(np.int32)
+    path = tmp_path / "run.ckpt"
+    expected, expected_len = refine_c4(order, coords)
+
+    # Interrupt the first 3-opt sweep a few outer steps in, as a kill right
+    # after a mid-sweep checkpoint would.
+    backend = get_backend()
+    route = order.copy()
+    while backend.two_point_five_opt_sweep(route, coords):
+        pass
+    improved, position = False, 0
+    for _ in range(5):
+        gained, position = backend.three_opt_sweep_until(route, coords, position, 0.0)
+        improved |= gained
+    save_checkpoint(path, route, coords, phase=1, iteration=0, position=position, improved=improved)
+    ckpt = load_checkpoint(path, coords)
+    assert (ckpt.position, ckpt.improved) == (5, improved)
+
+    resumed, length = resume_c4(coords, path)
+    assert np.array_equal(resumed, expected)
+    assert length == pytest.approx(expected_len)
+
+
+def test_resume_uses_stored_dp_window(tmp_path):
+    rng = np.random.default_rng(4)
+    coords = rng.random((40, 2)) * 100
+    order = rng.permutation(40).astype(np.int32)
+    path = tmp_path / "run.ckpt"
+
+    # Phase 3 is the DP polish for this schedule, not the end of the run.
+    route, _ = refine_c4(order, coords)
+    save_checkpoint(path, route, coords, phase=3, iteration=0, dp_window=8)
+    assert load_checkpoint(path, coords).dp_window == 8
+    with pytest.raises(ValueError):
+        resume_c4(coords, path, dp_window=0)
+
+    resumed, length = resume_c4(coords, path)
+    _, expected_len = refine_c4(order, coords, dp_window=8)
+    assert length == pytest.approx(expected_len)
+    assert length < tour_length(route, coords)
+    assert load_checkpoint(path, coords).phase == 4
+
+
+def test_compact_checkpoint_resumes_from_original_coords(tmp_path):
+    coords = np.random.default_rng(5).random((40, 2)) * 120
+    path = tmp_path / "compact.ckpt"
+    route, length = mts_gamma_C4(coords, SolverParams(grid=128, compact=True), checkpoint_path=path)
+
+    ckpt = load_checkpoint(path, coords)
+    assert ckpt.dtype == np.float32
+    resumed, resumed_len = resume_c4(coords, path)
+    assert np.array_equal(resumed, route)
+    assert resumed_len == pytest.approx(tour_length(route, coords))
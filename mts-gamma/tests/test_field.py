@@ -7,3 +7,10 @@ def test_build_field_shape():
     field = build_field(coords, grid=64, iter_gamma=5, smooth=1.0)
     assert field.shape == (64, 64)
     assert np.isfinite(field).all()
+
+
+def test_build_field_float32():
+    coords = np.array([[10.0, 10.0], [20.0, 20.0]])
+    field = build_field(coords, grid=64, iter_gamma=5, smooth=1.0, dtype=np.float32)
+    assert field.dtype == np.float32
+    np.testing.assert_allclose(field, build_field(coords, grid=64, iter_gamma=5, smooth=1.0), rtol=1e-5, atol=1e-7)
@@ -0,0 +1,28 @@
+import numpy as np
+from mtsgamma.merge import merge_tours, partition_crossover
+from mtsgamma.refine import tour_length, window_dp_opt
+
+
+def test_partition_crossover_never_worse_than_parents():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = int(rng.integers(3, 60))
+        coords = rng.random((n, 2)) * 100
+        a = window_dp_opt(rng.permutation(n).astype(np.int32), coords, 8)
+        b = a.copy()
+        i, j = sorted(rng.integers(0, n, 2))
+        b[i : j + 1] = b[i : j + 1][::-1]
+        b = window_dp_opt(b, coords, 8)
+        child = partition_crossover(a, b, coords)
+        assert sorted(child.tolist()) == list(range(n))
+        assert tour_length(child, coords) <= min(tour_length(a, coords), tour_length(b, coords)) + 1e-9
+
+
+def test_merge_tours_combines_improvements():
+    coords = np.array([[x, 0.0] for x in range(6)] + [[x, 10.0] for x in range(6)])
+    # Each parent has one bad local ordering in a different half.
+    a = np.array([0, 2, 1, 3, 4, 5, 11, 10, 9, 8, 7, 6], dtype=np.int32)
+    b = np.array([0, 1, 2, 3, 4, 5, 11, 10, 9, 7, 8, 6], dtype=np.int32)
+    route, length = merge_tours([a, b], coords)
+    assert length == tour_length(np.array([0, 1, 2, 3, 4, 5, 11, 10, 9, 8, 7, 6], dtype=np.int32), coords)
+    assert length < min(tour_length(a, coords), tour_length(b, coords))
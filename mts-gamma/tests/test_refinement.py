@@ -1,5 +1,9 @@
+import itertools
+
 import numpy as np
-from mtsgamma.refine import refine_c4, tour_length
+import pytest
+from mtsgamma.refine import _held_karp_window, refine_c4, tour_length, window_dp_sweep
+from mtsgamma.solver import SolverParams
 
 
 def test_refine_reduces_length():
@@ -9,3 +13,51 @@ def test_refine_reduces_length():
     new_route, new_len = refine_c4(order, coords)
     assert new_len <= initial + 1e-9
     assert new_route.shape[0] == order.shape[0]
+
+
+def test_two_point_five_opt_terminates_after_reversal():
+    np.random.seed(3)
+    coords = np.random.rand(20, 2) * 100
+    order = np.random.permutation(20).astype(np.int32)
+    new_route, new_len = refine_c4(order, coords)
+    assert sorted(new_route.tolist()) == list(range(20))
+    assert new_len <= tour_length(order, coords) + 1e-9
+
+
+def test_window_dp_finds_optimal_interior_order():
+    rng = np.random.default_rng(0)
+    coords = rng.random((9, 2)) * 100
+    route = rng.permutation(9).astype(np.int32)
+    best = min(
+        tour_length(np.array([route[0], *perm, route[-1]], dtype=np.int32), coords)
+        for perm in itertools.permutations(route[1:-1])
+    )
+    window_dp_sweep(route, coords, 9)
+    assert abs(tour_length(route, coords) - best) < 1e-9
+    assert sorted(route.tolist()) == list(range(9))
+
+
+def test_held_karp_window_python_path_large_window():
+    # The kernel source, run as plain Python by the numpy backend, must
+    # backtrack through masks wider than int8 for windows of 10+ cities.
+    for seed in range(5):
+        rng = np.random.default_rng(seed)
+        coords = rng.random((11, 2)) * 100
+        route = rng.permutation(11).astype(np.int32)
+        before = tour_length(route, coords)
+        _held_karp_window(route, coords, 0, 11)
+        assert sorted(route.tolist()) == list(range(11))
+        assert tour_length(route, coords) <= before + 1e-9
+
+
+@pytest.mark.parametrize("dp_window", [-1, 1, 2, 17, 300])
+def test_invalid_dp_window_rejected_before_refining(dp_window):
+    rng = np.random.default_rng(0)
+    coords = rng.random((30, 2)) * 100
+    order = rng.permutation(30).astype(np.int32)
+    untouched = order.copy()
+    with pytest.raises(ValueError):
+        refine_c4(order, coords, dp_window=dp_window, copy=False)
+    assert np.array_equal(order, untouched)
+    with pytest.raises(ValueError):
+        SolverParams(dp_window=dp_window)
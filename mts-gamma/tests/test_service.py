@@ -0,0 +1,160 @@
+import asyncio
+import json
+import time
+import urllib.request
+
+import numpy as np
+import pytest
+from mtsgamma import service as service_module
+from mtsgamma.service import SolveService, start_server
+from mtsgamma.solver import SolverParams
+
+
+def test_service_solves_and_cancels_over_localhost():
+    async def scenario():
+        service = SolveService(workers=1)
+        await service.start()
+        server = await start_server(service, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            coords = np.random.default_rng(1).random((30, 2)) * 100
+            body = json.dumps({"coords": coords.tolist(), "params": {"grid": 128, "iter_gamma": 20}}).encode()
+
+            def post():
+                req = urllib.request.Request(f"http://127.0.0.1:{port}/solve", data=body, method="POST")
+                with urllib.request.urlopen(req, timeout=60) as resp:
+                    return json.loads(resp.read())
+
+            first = asyncio.create_task(asyncio.to_thread(post))
+            queued = asyncio.create_task(service.submit(coords, request_id="later"))
+            # Cancel as soon as the job is registered. Depending on which
+            # request reached the dispatcher first it is queued or running;
+            # both paths must end in "cancelled".
+            while "later" not in service._jobs:
+                await asyncio.sleep(0)
+            assert service._jobs["later"].state in ("queued", "running")
+            assert service.cancel("later")
+
+            result = await first
+            assert result["status"] == "ok"
+            assert sorted(result["route"]) == list(range(30))
+            assert (await queued)["status"] == "cancelled"
+
+            metrics = service.metrics()
+            assert metrics["completed"] == 1
+            assert metrics["cancelled"] == 1
+            assert metrics["latency_p50"] is not None
+        finally:
+            server.close()
+            await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_service_survives_worker_death():
+    async def scenario():
+        service = SolveService(workers=1)
+        await service.start()
+        try:
+            # Large enough that 3-opt is still running when the worker is killed.
+            big = np.random.default_rng(2).random((2000, 2)) * 500
+            doomed = asyncio.create_task(service.submit(big, request_id="doomed"))
+            while "doomed" not in service._jobs or service._jobs["doomed"].state != "running":
+                await asyncio.sleep(0.01)
+            service._pool[0].process.kill()
+
+            result = await asyncio.wait_for(doomed, 30)
+            assert result["status"] == "error"
+            assert result["error"] == "worker died"
+
+            coords = np.random.default_rng(1).random((30, 2)) * 100
+            params = SolverParams(grid=128, iter_gamma=20)
+            after = await asyncio.wait_for(service.submit(coords, params, time_limit=60), 60)
+            assert after["status"] == "ok"
+            assert service.metrics()["failed"] == 1
+        finally:
+            await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failed_respawn_is_retried(caplog, monkeypatch):
+    monkeypatch.setattr(service_module, "RESPAWN_BACKOFF", (0.01, 0.01))
+
+    async def scenario():
+        service = SolveService(workers=1)
+        await service.start()
+        try:
+            worker = service._pool[0]
+            real_start = worker.start
+            failures = [EOFError("died during warm-up")]
+
+            async def flaky_start():
+                if failures:
+                    raise failures.pop()
+                await real_start()
+
+            worker.start = flaky_start
+            worker.process.kill()
+            worker.process.join()
+
+            coords = np.random.default_rng(1).random((30, 2)) * 100
+            params = SolverParams(grid=128, iter_gamma=20)
+            first = await asyncio.wait_for(service.submit(coords, params, time_limit=60), 60)
+            assert first["error"] == "worker died"
+            second = await asyncio.wait_for(service.submit(coords, params, time_limit=60), 60)
+            assert second["status"] == "ok"
+            assert "failed to start" in caplog.text
+        finally:
+            await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_queued_request_times_out_on_time():
+    async def scenario():
+        service = SolveService(workers=1)
+        await service.start()
+        try:
+            big = np.random.default_rng(2).random((2000, 2)) * 500
+            busy = asyncio.create_task(service.submit(big, request_id="busy"))
+            while "busy" not in service._jobs or service._jobs["busy"].state != "running":
+                await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+            result = await service.submit(big[:30], time_limit=0.5)
+            assert result["status"] == "timeout"
+            assert time.perf_counter() - start < 5.0
+            busy.cancel()
+        finally:
+            await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_expired_requests_free_their_queue_slots():
+    async def scenario():
+        service = SolveService(workers=1, queue_size=2)
+        await service.start()
+        try:
+            big = np.random.default_rng(2).random((2000, 2)) * 500
+            busy = asyncio.create_task(service.submit(big, request_id="busy"))
+            while "busy" not in service._jobs or service._jobs["busy"].state != "running":
+                await asyncio.sleep(0.01)
+
+            expired = await asyncio.gather(*(service.submit(big[:30], time_limit=0.2) for _ in range(2)))
+            assert [r["status"] for r in expired] == ["timeout", "timeout"]
+            assert service.metrics()["queue_depth"] == 0
+            assert (await service.submit(big[:30], time_limit=0.2))["status"] == "timeout"
+            busy.cancel()
+        finally:
+            await service.stop()
+
+    asyncio.run(scenario())
+
+
+def test_service_defaults_to_single_threaded_backend():
+    assert SolveService(workers=1).backend in ("numba", "numpy")
+    assert SolveService(workers=1, backend="numpy").metrics()["backend"] == "numpy"
+    with pytest.raises(ValueError):
+        SolveService(workers=1, backend="no-such-backend")
@@ -1,5 +1,5 @@
 import numpy as np
-from mtsgamma.solver import mts_gamma_C4
+from mtsgamma.solver import SolverParams, mts_gamma_C4
 
 
 def test_solver_returns_cycle():
@@ -7,3 +7,11 @@ def test_solver_returns_cycle():
     route, length = mts_gamma_C4(coords)
     assert route.shape[0] == coords.shape[0]
     assert np.isfinite(length)
+
+
+def test_solver_compact_mode_matches_float64_closely():
+    coords = np.random.default_rng(4).random((40, 2)) * 100
+    route, length = mts_gamma_C4(coords, SolverParams(grid=128, compact=True))
+    _, full_length = mts_gamma_C4(coords, SolverParams(grid=128))
+    assert sorted(route.tolist()) == list(range(40))
+    assert abs(length - full_length) / full_length < 0.05